@@ -4,12 +4,12 @@ Main auditor class that coordinates multiple indexing services
 """
 import asyncio
 import logging
-from typing import List, Optional
+from typing import List, Optional, Sequence
 import time
 import json
 
 from models import ServiceConfig, AuditResult, RangeAuditResult, ServiceResult, ServiceType
-from service_interface import IndexServiceInterface
+from service_interface import IndexServiceInterface, close_shared_connectors
 from service_implementations import create_service_instance
 from rate_limiter import RangeAuditRateLimiter
 
@@ -65,7 +65,7 @@ class TweakServiceAuditor:
             AuditResult containing results from all services
         """
         self.logger.info(f"Starting audit for block {block_height}")
-        start_time = time.time()
+        start_time = time.monotonic()
         
         # Create rate-limited tasks for each service
         tasks = []
@@ -104,12 +104,18 @@ class TweakServiceAuditor:
             successful_services=sum(1 for r in processed_results if r.success)
         )
         
-        total_time = time.time() - start_time
+        total_time = time.monotonic() - start_time
         self.logger.info(f"Completed audit for block {block_height} in {total_time:.2f}s")
         self._log_audit_summary(audit_result)
         
         return audit_result
     
+    async def close(self):
+        """Release network connections held by the services and the shared pools"""
+        for service in self.service_instances:
+            await service.close()
+        await close_shared_connectors()
+    
     async def _rate_limited_service_call(self, service: IndexServiceInterface, block_height: int) -> ServiceResult:
         """
         Make a rate-limited call to a service
@@ -130,6 +136,66 @@ class TweakServiceAuditor:
         # Make the actual service call
         return await service.get_tweaks_for_block(block_height)
 
+    async def _service_batch_call(self, service: IndexServiceInterface, block_heights: Sequence[int]) -> List[ServiceResult]:
+        """
+        Fetch a batch of blocks from a service
+        
+        Services that batch ranges get the whole batch in one call; others get
+        concurrent per-block requests. With rate limiting, every block takes a
+        token either way: batching services are sent a sub-batch of
+        range_batch_size blocks once its tokens are acquired.
+        
+        Args:
+            service: The service instance to call
+            block_heights: The block heights to audit
+            
+        Returns:
+            ServiceResults in the same order as block_heights
+        """
+        if service.batches_ranges:
+            if not self.enable_rate_limiting:
+                return await service.get_tweaks_for_range(block_heights[0], block_heights[-1])
+            step = service.range_batch_size
+            tasks = []
+            try:
+                for i in range(0, len(block_heights), step):
+                    sub_batch = block_heights[i:i + step]
+                    for _ in sub_batch:
+                        await self.rate_limiter.acquire_service_token(service.config.name)
+                    # Earlier sub-batches run while the next one's tokens are acquired
+                    tasks.append(asyncio.ensure_future(service.get_tweaks_for_range(sub_batch[0], sub_batch[-1])))
+                sub_batch_results = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                raise
+            return [result for results in sub_batch_results for result in results]
+        if self.enable_rate_limiting:
+            return await asyncio.gather(
+                *(self._rate_limited_service_call(service, block_height) for block_height in block_heights)
+            )
+        return await service.get_tweaks_for_blocks(block_heights)
+    
+    async def _stream_batch_call(self, service: IndexServiceInterface, batch_start: int, batch_end: int) -> List[ServiceResult]:
+        """
+        Stream one batch of blocks from a streaming service
+        
+        Each batch opens its own stream, so the per-request timeout covers one
+        batch rather than the whole range.
+        
+        Args:
+            service: The streaming service instance to call
+            batch_start: First block height of the batch
+            batch_end: Last block height of the batch
+            
+        Returns:
+            The streamed ServiceResults, in the order the service sent them
+        """
+        if self.enable_rate_limiting:
+            # One token per stream; a stream is a single request to the server
+            await self.rate_limiter.acquire_service_token(service.config.name)
+        return [result async for result in service.stream_tweaks_for_range(batch_start, batch_end)]
+    
     async def audit_range(self, start_block: int, end_block: int, batch_size: int = 200, 
                          output_file: Optional[str] = None) -> RangeAuditResult:
         """
@@ -176,44 +242,42 @@ class TweakServiceAuditor:
             output_handle.write('{"blocks":[')
             first_block = True
         
-        # Process streaming services first (BlindBit gRPC)
-        streaming_results_dict = {}
-        for service in streaming_services:
-            try:
-                self.logger.debug(f"Getting streaming results for {service.config.name}")
-                if self.enable_rate_limiting:
-                    # Acquire rate limit token for the entire range
-                    await self.rate_limiter.acquire_service_token(service.config.name)
-                
-                stream_results = await service.get_tweaks_for_range_stream(start_block, end_block)
-                
-                if not stream_results:
-                    self.logger.error(f"Streaming failed for {service.config.name}, falling back to individual requests")
-                    # Fall back to individual requests for this service
-                    non_streaming_services.append(service)
-                else:
-                    # Add streaming results organized by block height
-                    for result in stream_results:
-                        block_height = result.block_height
-                        if block_height not in streaming_results_dict:
-                            streaming_results_dict[block_height] = []
-                        streaming_results_dict[block_height].append(result)
-                        
-            except Exception as e:
-                self.logger.error(f"Streaming service {service.config.name} failed: {e}, falling back to individual requests")
-                # Fall back to individual requests for this service
-                non_streaming_services.append(service)
-        
         try:
-            # Process non-streaming services in batches for memory efficiency
+            # Process blocks in batches for memory efficiency
             for batch_start in range(start_block, end_block + 1, batch_size):
                 batch_end = min(batch_start + batch_size - 1, end_block)
                 self.logger.info(f"Processing batch: blocks {batch_start}-{batch_end}")
                 
                 batch_results = []
+                batch_heights = range(batch_start, batch_end + 1)
+                
+                # Stream the batch from each streaming service (BlindBit gRPC) while
+                # fetching it from each non-streaming service, all concurrently
+                stream_count = len(streaming_services)
+                gathered = await asyncio.gather(
+                    *(self._stream_batch_call(service, batch_start, batch_end) for service in streaming_services),
+                    *(self._service_batch_call(service, batch_heights) for service in non_streaming_services),
+                    return_exceptions=True
+                )
+                batch_service_results = list(gathered[stream_count:])
+                
+                streaming_results_dict = {}
+                for service, results in zip(list(streaming_services), gathered[:stream_count]):
+                    if isinstance(results, Exception):
+                        self.logger.error(f"Streaming service {service.config.name} failed: {results}, falling back to individual requests")
+                        # Fall back to individual requests for this service from this batch on
+                        streaming_services.remove(service)
+                        non_streaming_services.append(service)
+                        try:
+                            batch_service_results.append(await self._service_batch_call(service, batch_heights))
+                        except Exception as e:
+                            batch_service_results.append(e)
+                        continue
+                    for result in results:
+                        streaming_results_dict.setdefault(result.block_height, []).append(result)
                 
                 # Process each block in the batch
-                for block_height in range(batch_start, batch_end + 1):
+                for block_index, block_height in enumerate(batch_heights):
                     try:
                         # Combine streaming results with non-streaming results for this block
                         combined_service_results = []
@@ -222,21 +286,11 @@ class TweakServiceAuditor:
                         if block_height in streaming_results_dict:
                             combined_service_results.extend(streaming_results_dict[block_height])
                         
-                        # Process non-streaming services for this block
+                        # Collect non-streaming service results for this block
                         if non_streaming_services:
-                            tasks = []
-                            for service in non_streaming_services:
-                                if self.enable_rate_limiting:
-                                    task = self._rate_limited_service_call(service, block_height)
-                                else:
-                                    task = service.get_tweaks_for_block(block_height)
-                                tasks.append(task)
-                            
-                            # Wait for all non-streaming services to complete
-                            service_results = await asyncio.gather(*tasks, return_exceptions=True)
-                            
-                            # Handle any exceptions
-                            for i, result in enumerate(service_results):
+                            # Handle any exceptions (a failed batch fails each of its blocks)
+                            for i, results in enumerate(batch_service_results):
+                                result = results if isinstance(results, Exception) else results[block_index]
                                 if isinstance(result, Exception):
                                     self.logger.error(f"Service {non_streaming_services[i].config.name} failed for block {block_height}: {result}")
                                     # Create a failed ServiceResult
@@ -280,11 +334,6 @@ class TweakServiceAuditor:
                 # Log batch completion and clear batch results to free memory
                 self.logger.info(f"Completed batch {batch_start}-{batch_end}: {len(batch_results)} blocks")
                 batch_results.clear()  # Free memory immediately
-                
-                # Clear processed streaming results to free memory
-                for block_height in range(batch_start, batch_end + 1):
-                    if block_height in streaming_results_dict:
-                        del streaming_results_dict[block_height]
         
         finally:
             if output_handle:
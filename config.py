@@ -47,7 +47,14 @@ class ConfigManager:
                     active=service_data.get('active'),
                     requests_per_second=service_data.get('requests_per_second', 200),
                     filter_spent=service_data.get('filter_spent'),
-                    dust_limit=service_data.get('dust_limit')
+                    dust_limit=service_data.get('dust_limit'),
+                    reorg_depth=service_data.get('reorg_depth', 6),
+                    pool_size=service_data.get('pool_size', 100),
+                    pool_per_host=service_data.get('pool_per_host', 10),
+                    grpc_channels=service_data.get('grpc_channels', 3),
+                    max_concurrent=service_data.get('max_concurrent', 10),
+                    keep_raw=service_data.get('keep_raw', False),
+                    prefer_http2=service_data.get('prefer_http2', False)
                 )
                 self.services.append(service_config)
             
@@ -0,0 +1,32 @@
+"""
+JSON encoding helpers for the Silent Payments Tweak Service Auditor
+Uses orjson when it is installed and falls back to the standard library
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Encode an object as a compact JSON string (usable as aiohttp's json_serialize)"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode an object as compact UTF-8 JSON bytes, ready to write to a socket"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
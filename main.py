@@ -260,9 +260,12 @@ def store_test_data(result: AuditResult, service_configs: List[ServiceConfig], r
             
         test_data["tweaks"].append(optimized_tweak)
     
-    # Write test data to file
-    with open(filepath, 'w') as f:
+    # Write test data to a temporary file and swap it in, so the directory
+    # changes and TestDataIndexService drops any cached copy of the old file
+    tmp_filepath = filepath.with_suffix('.json.tmp')
+    with open(tmp_filepath, 'w') as f:
         json.dump(test_data, f, indent=2)
+    os.replace(tmp_filepath, filepath)
     
     print(f"Test data stored to {filepath} (reference: {reference_result.service_name}, {len(reference_result.tweaks)} tweaks)")
 
@@ -350,6 +353,11 @@ async def _audit_common_config(args):
             print(f"  - {issue}")
         return None, None, 1
     
+    # Stored test data includes each tweak's raw payload, so keep it in memory
+    if getattr(args, 'store_test', False):
+        for service in config_manager.services:
+            service.keep_raw = True
+    
     # Pass ignore-filter-mismatch flag to the auditor
     ignore_filter_mismatch = getattr(args, 'ignore_filter_mismatch', False)
     auditor = TweakServiceAuditor(config_manager.services, ignore_filter_mismatch=ignore_filter_mismatch)
@@ -409,6 +417,8 @@ async def audit_single_block(args):
     except Exception as e:
         print(f"Error during audit: {e}")
         return 1
+    finally:
+        await auditor.close()
 
 
 async def audit_block_range(args):
@@ -494,6 +504,8 @@ async def audit_block_range(args):
     except Exception as e:
         print(f"Error during range audit: {e}")
         return 1
+    finally:
+        await auditor.close()
 
 
 def manage_config(args):
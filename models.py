@@ -25,9 +25,9 @@ class ServicePair:
     active: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class TweakData:
-    """Normalized tweak data structure"""
+    """Normalized tweak data structure (slotted: one is built per tweak)"""
     tweak_hash: str
     block_height: int
     transaction_id: str
@@ -51,11 +51,18 @@ class ServiceConfig:
     requests_per_second: float = 200.0  # Max requests per second for this service
     filter_spent: Optional[bool] = None  # For bitcoin & blindbit: whether to filter spent outputs
     dust_limit: Optional[int] = None  # For bitcoin & blindbit: dust limit threshold
+    reorg_depth: int = 6  # For bitcoin: blocks this close to the tip are not hash-cached
+    pool_size: int = 100  # Max pooled HTTP connections shared across services
+    pool_per_host: int = 10  # Max pooled HTTP connections per host
+    grpc_channels: int = 3  # For gRPC: channels (connections) used round-robin
+    max_concurrent: int = 10  # Max requests in flight to this service
+    keep_raw: bool = False  # Keep each tweak's raw service payload in TweakData.raw_data
+    prefer_http2: bool = False  # For HTTP services: use an httpx HTTP/2 client instead of aiohttp
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceResult:
-    """Result from a single indexing service"""
+    """Result from a single indexing service (slotted: one is built per service per block)"""
     service_name: str
     block_height: int
     tweaks: List[TweakData]
@@ -35,7 +35,7 @@ class ServiceRateLimiter:
         """
         self.limiters[service_name] = RateLimiterState(
             tokens=1.0,  # Start with one token available
-            last_update=time.time(),
+            last_update=time.monotonic(),
             refill_rate=requests_per_second
         )
     
@@ -56,7 +56,7 @@ class ServiceRateLimiter:
         limiter = self.limiters[service_name]
         
         while True:
-            now = time.time()
+            now = time.monotonic()
             time_passed = now - limiter.last_update
             
             # Add tokens based on time passed
@@ -87,7 +87,7 @@ class ServiceRateLimiter:
             return {"tokens": float('inf'), "refill_rate": float('inf')}
         
         limiter = self.limiters[service_name]
-        now = time.time()
+        now = time.monotonic()
         time_passed = now - limiter.last_update
         tokens_to_add = time_passed * limiter.refill_rate
         current_tokens = min(1.0, limiter.tokens + tokens_to_add)
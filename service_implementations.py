@@ -2,41 +2,90 @@
 Example implementations of specific indexing services
 These demonstrate how to extend the base HTTP and RPC service classes
 """
+import asyncio
 import time
 import aiohttp
 import os
-import json
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Any, Union
-from service_interface import HTTPIndexService, RPCIndexService, SocketRPCIndexService, GRPCIndexService, IndexServiceInterface
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional, Set, Tuple, Type, Union
+import json_codec
+from service_interface import HTTPIndexService, RPCIndexService, SocketRPCIndexService, GRPCIndexService, IndexServiceInterface, read_error_body
 from models import TweakData, ServiceConfig, ServiceType, ServiceResult
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
+# Only stream-parse with ijson's C backend; its pure-Python backends are slower
+# than decoding the buffered body in one go
+_STREAM_PARSE = ijson is not None and ijson.backend_name == 'yajl2_c'
+
+
+# Service classes per service type, matched in registration order against the
+# lowercased service name; the class registered without substrings is the fallback
+_SERVICE_REGISTRY: Dict[ServiceType, List[Tuple[str, Type[IndexServiceInterface]]]] = {}
+_DEFAULT_SERVICES: Dict[ServiceType, Type[IndexServiceInterface]] = {}
+
+
+def register_service(service_type: ServiceType, *name_substrings: str) -> Callable[[Type[IndexServiceInterface]], Type[IndexServiceInterface]]:
+    """
+    Class decorator registering a service implementation with create_service_instance
+    
+    Args:
+        service_type: The ServiceType the class handles
+        name_substrings: Lowercase substrings of the service name that select the class;
+            when none are given the class becomes the default for service_type
+        
+    Returns:
+        Decorator returning the class unchanged
+    """
+    def decorator(cls: Type[IndexServiceInterface]) -> Type[IndexServiceInterface]:
+        if name_substrings:
+            _SERVICE_REGISTRY.setdefault(service_type, []).extend(
+                (substring, cls) for substring in name_substrings
+            )
+        else:
+            _DEFAULT_SERVICES[service_type] = cls
+        return cls
+    return decorator
+
+
+register_service(ServiceType.SOCKET_RPC)(SocketRPCIndexService)
+
+
+@register_service(ServiceType.HTTP)
 class ExampleHTTPService(HTTPIndexService):
     """Example HTTP-based indexing service"""
     
+    def __init__(self, config: ServiceConfig):
+        super().__init__(config)
+        self._url_prefix = f"{config.endpoint}/api/v1/silent-payments/block/"
+    
     def _build_url(self, block_height: int) -> str:
         """Build service-specific URL"""
-        return f"{self.config.endpoint}/api/v1/silent-payments/block/{block_height}"
+        return self._url_prefix + str(block_height)
     
     def _normalize_response(self, raw_response: Any, block_height: int) -> List[TweakData]:
         """Normalize this service's response format"""
-        tweaks = []
-        
-        if isinstance(raw_response, dict) and 'silent_payment_tweaks' in raw_response:
-            for tweak_data in raw_response['silent_payment_tweaks']:
-                tweak = TweakData(
-                    tweak_hash=tweak_data.get('tweak', ''),
-                    block_height=block_height,
-                    transaction_id=tweak_data.get('transaction_hash', ''),
-                    output_index=tweak_data.get('output_index', 0),
-                    raw_data=tweak_data
-                )
-                tweaks.append(tweak)
+        if not (isinstance(raw_response, dict) and 'silent_payment_tweaks' in raw_response):
+            return []
         
-        return tweaks
+        keep_raw = self.config.keep_raw
+        return [
+            TweakData(
+                tweak_hash=tweak_data.get('tweak', ''),
+                block_height=block_height,
+                transaction_id=tweak_data.get('transaction_hash', ''),
+                output_index=tweak_data.get('output_index', 0),
+                raw_data=tweak_data if keep_raw else None
+            )
+            for tweak_data in raw_response['silent_payment_tweaks']
+        ]
 
 
+@register_service(ServiceType.RPC)
 class ExampleRPCService(RPCIndexService):
     """Example RPC-based indexing service"""
     
@@ -54,209 +103,489 @@ class ExampleRPCService(RPCIndexService):
     
     def _normalize_response(self, raw_response: Any, block_height: int) -> List[TweakData]:
         """Normalize this service's response format"""
-        tweaks = []
-        
-        if isinstance(raw_response, dict) and 'tweaks' in raw_response:
-            for tweak_data in raw_response['tweaks']:
-                tweak = TweakData(
-                    tweak_hash=tweak_data.get('hash', ''),
-                    block_height=block_height,
-                    transaction_id=tweak_data.get('tx_id', ''),
-                    output_index=tweak_data.get('vout', 0),
-                    raw_data=tweak_data
-                )
-                tweaks.append(tweak)
+        if not (isinstance(raw_response, dict) and 'tweaks' in raw_response):
+            return []
         
-        return tweaks
+        keep_raw = self.config.keep_raw
+        return [
+            TweakData(
+                tweak_hash=tweak_data.get('hash', ''),
+                block_height=block_height,
+                transaction_id=tweak_data.get('tx_id', ''),
+                output_index=tweak_data.get('vout', 0),
+                raw_data=tweak_data if keep_raw else None
+            )
+            for tweak_data in raw_response['tweaks']
+        ]
+
+
+# Pre-serialized JSON-RPC request bodies for the calls whose only parameter is a height
+_BLOCK_HASH_TMPL = b'{"jsonrpc":"1.0","id":"get_block_hash","method":"getblockhash","params":[%d]}'
+_BLOCK_HASH_BATCH_TMPL = b'{"jsonrpc":"1.0","id":%d,"method":"getblockhash","params":[%d]}'
+_BLOCK_COUNT_ID = "get_block_count"
+_BLOCK_COUNT_BODY = b'{"jsonrpc":"1.0","id":"get_block_count","method":"getblockcount","params":[]}'
+
+# Block hashes for confirmed heights never change, so they are shared across
+# service instances and audits within the process, keyed by (endpoint, height)
+_BLOCK_HASH_CACHE: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+_BLOCK_HASH_CACHE_SIZE = 100_000
+
+# Seconds a fetched chain tip height is trusted before getblockcount is asked
+# again; a stale tip only errs towards caching fewer hashes
+_CHAIN_TIP_TTL = 10.0
 
+# Minimum seconds between checks of the cookie file for rotation
+_COOKIE_RECHECK_INTERVAL = 1.0
 
+# BIP352 tweaks are 33-byte compressed public keys, so 66 hex characters
+_TWEAK_HEX_LEN = 66
+_HEX_DIGITS = b'0123456789abcdefABCDEF'
+
+
+def _is_tweak_hex(value: str) -> bool:
+    """Check that a tweak string is exactly one compressed point in hex"""
+    # Deleting every hex digit in C leaves nothing behind for a valid string
+    return (
+        len(value) == _TWEAK_HEX_LEN
+        and value.isascii()
+        and not value.encode('ascii').translate(None, _HEX_DIGITS)
+    )
+
+
+@register_service(ServiceType.RPC, 'bitcoin')
 class BitcoinCoreRPCService(RPCIndexService):
     """Bitcoin Core RPC service implementation"""
     
-    def _get_cookie_auth(self) -> aiohttp.BasicAuth:
+    batches_ranges = True
+    # Blocks per pair of JSON-RPC batch requests, so one slow or failed batch
+    # (and its buffered response) covers a bounded part of a range
+    range_batch_size = 25
+    
+    def __init__(self, config: ServiceConfig):
+        super().__init__(config)
+        self._chain_tip: Optional[int] = None
+        self._chain_tip_checked = 0.0
+        self._cookie_auth: Optional[aiohttp.BasicAuth] = None
+        self._cookie_mtime: Optional[float] = None
+        self._cookie_checked = 0.0
+        # Credentials from config never change, so build them once
+        self._config_auth: Optional[aiohttp.BasicAuth] = None
+        if config.auth and 'username' in config.auth and 'password' in config.auth:
+            self._config_auth = aiohttp.BasicAuth(
+                login=config.auth['username'],
+                password=config.auth['password']
+            )
+        
+        # Use filter_spent and dust_limit from config if available, otherwise default
+        sp_filter_params = [
+            config.dust_limit if config.dust_limit is not None else 0,
+            config.filter_spent if config.filter_spent is not None else False
+        ]
+        # Everything but the block hash is constant, so serialize it once; the
+        # request bodies are then filled in with bytes formatting per block
+        sp_data_tail = b'",' + json_codec.dumps(sp_filter_params)[1:].encode() + b'}'
+        self._sp_data_tmpl = (b'{"jsonrpc":"1.0","id":"silent_payments_audit",'
+                              b'"method":"getsilentpaymentblockdata","params":["%s' + sp_data_tail)
+        self._sp_data_batch_tmpl = b'{"jsonrpc":"1.0","id":%d,"method":"getsilentpaymentblockdata","params":["%s' + sp_data_tail
+    
+    @staticmethod
+    def _read_cookie_sync(cookie_path: str, known_mtime: Optional[float]) -> Tuple[float, Optional[str]]:
+        """
+        Stat the cookie file and read it if it changed (blocking, run in a worker thread)
+        
+        Returns:
+            Tuple of (mtime, contents); contents is None when mtime equals known_mtime
+        """
+        mtime = os.stat(cookie_path).st_mtime
+        if mtime == known_mtime:
+            return mtime, None
+        with open(cookie_path, 'r') as f:
+            return mtime, f.read().strip()
+    
+    async def _get_cookie_auth(self) -> Optional[aiohttp.BasicAuth]:
         """
         Read Bitcoin Core cookie file and return BasicAuth for aiohttp
         
+        The parsed auth is cached; at most once per _COOKIE_RECHECK_INTERVAL
+        the file is checked in a worker thread and only re-read when its mtime
+        changed (bitcoind rewrites it on restart), so no file I/O ever runs
+        on the event loop.
+        
         Returns:
             aiohttp.BasicAuth object if cookie file exists and is readable, None otherwise
         """
         if not self.config.cookie_file:
             return None
+        
+        now = time.monotonic()
+        if self._cookie_auth is not None and now - self._cookie_checked < _COOKIE_RECHECK_INTERVAL:
+            return self._cookie_auth
+        self._cookie_checked = now
             
         # Expand user path if needed (e.g., ~ to home directory)
         cookie_path = os.path.expanduser(self.config.cookie_file)
         
-        if os.path.exists(cookie_path):
-            try:
-                # Read the cookie file
-                with open(cookie_path, 'r') as f:
-                    cookie_content = f.read().strip()
+        try:
+            mtime, cookie_content = await asyncio.to_thread(self._read_cookie_sync, cookie_path, self._cookie_mtime)
+        except FileNotFoundError:
+            self.logger.error(f"Cannot find cookie file {cookie_path}")
+            self._cookie_auth, self._cookie_mtime = None, None
+            return None
+        except Exception as e:
+            self.logger.error(f"Failed to read cookie file {cookie_path}: {e}")
+            return None
+        
+        if cookie_content is None:
+            return self._cookie_auth
+        
+        # Bitcoin Core cookie format is "username:password"
+        if ':' not in cookie_content:
+            self.logger.warning(f"Invalid cookie file format in {cookie_path}")
+            return None
+        
+        username, password = cookie_content.split(':', 1)
+        self.logger.debug("Successfully loaded cookie authentication for user: %s", username)
+        self._cookie_auth = aiohttp.BasicAuth(login=username, password=password)
+        self._cookie_mtime = mtime
+        return self._cookie_auth
+
+    async def _get_auth(self) -> Optional[aiohttp.BasicAuth]:
+        """Get RPC credentials: the cookie file first, then username/password from config"""
+        # First try cookie authentication
+        cookie_auth = await self._get_cookie_auth()
+        if cookie_auth:
+            return cookie_auth
+        # Fallback to username/password if provided
+        return self._config_auth
+    
+    def _check_auth_status(self, status: int):
+        """On HTTP 401, drop the cached cookie so the next request re-reads the file"""
+        if status == 401:
+            self._cookie_auth, self._cookie_mtime = None, None
+    
+    async def _rpc_result(self, session: aiohttp.ClientSession, auth: Optional[aiohttp.BasicAuth],
+                          body: bytes) -> Tuple[Any, Optional[str]]:
+        """
+        Make a single JSON-RPC call from a pre-serialized request body
+        
+        Returns:
+            Tuple of (result, error message); error message is None on success
+        """
+        async with session.post(self.config.endpoint, data=body, headers=self._headers, auth=auth) as response:
+            if response.status != 200:
+                self._check_auth_status(response.status)
+                return None, f"HTTP {response.status}: {await read_error_body(response)}"
+            data = json_codec.loads(await response.read())
+            if 'error' in data and data['error']:
+                return None, f"RPC error: {data['error']}"
+            return data.get('result'), None
+
+    async def _get_block_hash(self, session: aiohttp.ClientSession, auth: Optional[aiohttp.BasicAuth],
+                              block_height: int) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get the block hash for a height, served from the process-wide cache when possible
+        
+        Only heights at least reorg_depth blocks below the chain tip are cached,
+        since anything closer to the tip may still be reorganized.
+        
+        Returns:
+            Tuple of (block hash, error message); error message is None on success
+        """
+        cache_key = (self.config.endpoint, block_height)
+        block_hash = _BLOCK_HASH_CACHE.get(cache_key)
+        if block_hash:
+            _BLOCK_HASH_CACHE.move_to_end(cache_key)
+            self.logger.debug("Block hash cache hit for height %s", block_height)
+            return block_hash, None
+        
+        self.logger.debug("Getting block hash for height %s", block_height)
+        result, error = await self._rpc_result(session, auth, _BLOCK_HASH_TMPL % block_height)
+        if error:
+            return None, f"Failed to get block hash: {error}"
+        if not result:
+            return None, f"No block hash returned for height {block_height}"
+        
+        # Refresh the known tip only when this height might be inside the reorg
+        # window, and at most once per _CHAIN_TIP_TTL
+        if self._chain_tip is None or block_height > self._chain_tip - self.config.reorg_depth:
+            if self._chain_tip_stale():
+                tip, error = await self._rpc_result(session, auth, _BLOCK_COUNT_BODY)
+                if error:
+                    self.logger.debug("Could not refresh chain tip, not caching block hash: %s", error)
+                    return result, None
+                self._set_chain_tip(tip)
+        
+        self._cache_block_hash(block_height, result)
+        return result, None
+    
+    def _chain_tip_stale(self) -> bool:
+        """Whether the known chain tip is missing or older than _CHAIN_TIP_TTL"""
+        return self._chain_tip is None or time.monotonic() - self._chain_tip_checked >= _CHAIN_TIP_TTL
+    
+    def _set_chain_tip(self, tip: int):
+        """Record a freshly fetched chain tip height"""
+        self._chain_tip = tip
+        self._chain_tip_checked = time.monotonic()
+    
+    def _cache_block_hash(self, block_height: int, block_hash: str):
+        """Cache a block hash if its height is buried below the reorg window"""
+        if self._chain_tip is not None and block_height <= self._chain_tip - self.config.reorg_depth:
+            _BLOCK_HASH_CACHE[(self.config.endpoint, block_height)] = block_hash
+            if len(_BLOCK_HASH_CACHE) > _BLOCK_HASH_CACHE_SIZE:
+                _BLOCK_HASH_CACHE.popitem(last=False)
+    
+    async def _rpc_batch(self, session: aiohttp.ClientSession, auth: Optional[aiohttp.BasicAuth],
+                         bodies: List[bytes]) -> Dict[Any, Dict[str, Any]]:
+        """
+        Send several pre-serialized JSON-RPC calls in one HTTP request
+        
+        Returns:
+            Responses keyed by request id
+            
+        Raises:
+            RuntimeError: If the batch as a whole fails
+        """
+        payload = b'[' + b','.join(bodies) + b']'
+        async with session.post(self.config.endpoint, data=payload, headers=self._headers, auth=auth) as response:
+            if response.status != 200:
+                self._check_auth_status(response.status)
+                raise RuntimeError(f"RPC HTTP {response.status}: {await read_error_body(response)}")
+            responses = json_codec.loads(await response.read())
+        if not isinstance(responses, list):
+            raise RuntimeError(f"RPC batch error: {responses.get('error') if isinstance(responses, dict) else responses}")
+        return {item.get('id'): item for item in responses}
+    
+    async def get_tweaks_for_range(self, start_block: int, end_block: int) -> List[ServiceResult]:
+        """
+        Get tweaks for a range of blocks using JSON-RPC batch requests
+        
+        The range is split into sub-batches of range_batch_size blocks,
+        fetched concurrently (within config.max_concurrent), each with its
+        own request timeout.
+        
+        Args:
+            start_block: Starting block height (inclusive)
+            end_block: Ending block height (inclusive)
+            
+        Returns:
+            ServiceResults ordered by block height
+        """
+        heights = list(range(start_block, end_block + 1))
+        if len(heights) == 1:
+            return [await self.get_tweaks_for_block(start_block)]
+        
+        step = self.range_batch_size
+        batch_results = await asyncio.gather(
+            *(self._fetch_rpc_batch(heights[i:i + step]) for i in range(0, len(heights), step))
+        )
+        return [result for results in batch_results for result in results]
+    
+    async def _fetch_rpc_batch(self, heights: List[int]) -> List[ServiceResult]:
+        """
+        Get tweaks for a few blocks using two JSON-RPC batch requests
+        
+        All getblockhash calls (plus getblockcount when the known tip is
+        older than _CHAIN_TIP_TTL, for the hash cache) go in one batch, then all
+        getsilentpaymentblockdata calls in a second, instead of two round
+        trips per block. Each block's request_time is its share of the total.
+        If a batch fails as a whole (e.g. the server does not accept batch
+        requests), the blocks still missing are fetched one by one with
+        config.max_concurrent requests in flight.
+        
+        Args:
+            heights: The block heights to query
+            
+        Returns:
+            ServiceResults in the same order as heights
+        """
+        start_time = time.perf_counter()
+        block_hashes: Dict[int, str] = {}
+        errors: Dict[int, str] = {}
+        tweaks_by_height: Dict[int, List[TweakData]] = {}
+        
+        try:
+            auth = await self._get_auth()
+            
+            async with self._request_slots:
+                session = self._get_session()
                 
-                # Bitcoin Core cookie format is "username:password"
-                if ':' in cookie_content:
-                    username, password = cookie_content.split(':', 1)
-                    self.logger.debug(f"Successfully loaded cookie authentication for user: {username}")
-                    return aiohttp.BasicAuth(login=username, password=password)
-                else:
-                    self.logger.warning(f"Invalid cookie file format in {cookie_path}")
-                    return None
+                # Step 1: Block hashes for every height not already cached
+                for height in heights:
+                    cached = _BLOCK_HASH_CACHE.get((self.config.endpoint, height))
+                    if cached:
+                        block_hashes[height] = cached
+                missing = [height for height in heights if height not in block_hashes]
+                if missing:
+                    bodies = [_BLOCK_HASH_BATCH_TMPL % (height, height) for height in missing]
+                    refresh_tip = self._chain_tip_stale()
+                    if refresh_tip:
+                        bodies.append(_BLOCK_COUNT_BODY)
+                    responses = await self._rpc_batch(session, auth, bodies)
+                    
+                    tip_response = responses.get(_BLOCK_COUNT_ID, {}) if refresh_tip else {}
+                    if not tip_response.get('error') and tip_response.get('result') is not None:
+                        self._set_chain_tip(tip_response['result'])
                     
-            except Exception as e:
-                self.logger.error(f"Failed to read cookie file {cookie_path}: {e}")
-                return None
+                    for height in missing:
+                        item = responses.get(height, {})
+                        if item.get('error'):
+                            errors[height] = f"Failed to get block hash: RPC error: {item['error']}"
+                        elif not item.get('result'):
+                            errors[height] = f"No block hash returned for height {height}"
+                        else:
+                            block_hashes[height] = item['result']
+                            self._cache_block_hash(height, item['result'])
+                
+                # Step 2: Silent payment data for every block with a hash
+                if block_hashes:
+                    bodies = [self._sp_data_batch_tmpl % (height, block_hash.encode())
+                              for height, block_hash in block_hashes.items()]
+                    responses = await self._rpc_batch(session, auth, bodies)
+                    
+                    for height in block_hashes:
+                        item = responses.get(height, {})
+                        if item.get('error'):
+                            errors[height] = f"RPC error: {item['error']}"
+                        else:
+                            tweaks_by_height[height] = await self._normalize_response_async(item.get('result') or {}, height)
+        
+        except Exception as e:
+            self.logger.warning(f"Bitcoin Core RPC batch request error, fetching blocks individually: {str(e)}")
+            remaining = [height for height in heights if height not in tweaks_by_height]
+            fallback = dict(zip(remaining, await self.get_tweaks_for_blocks(remaining)))
+            errors = {}
         else:
-            self.logger.error(f"Cannot find cookie file {cookie_path}")
-            return None
+            fallback = {}
+        
+        request_time = (time.perf_counter() - start_time) / len(heights)
+        results = []
+        for height in heights:
+            if height in fallback:
+                results.append(fallback[height])
+            elif height in tweaks_by_height:
+                results.append(ServiceResult(
+                    service_name=self.config.name,
+                    block_height=height,
+                    tweaks=tweaks_by_height[height],
+                    request_time=request_time,
+                    success=True
+                ))
+            else:
+                error_msg = errors.get(height, f"No response for block {height}")
+                self.logger.error(error_msg)
+                results.append(ServiceResult(
+                    service_name=self.config.name,
+                    block_height=height,
+                    tweaks=[],
+                    request_time=request_time,
+                    success=False,
+                    error_message=error_msg
+                ))
+        return results
 
-    async def get_tweaks_for_block(self, block_height: int) -> ServiceResult:
+    async def _fetch_tweaks_for_block(self, block_height: int) -> ServiceResult:
         """Get tweaks via Bitcoin Core RPC - requires two sequential calls"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            # Setup authentication
-            auth = None
+            # Credentials are passed per request so a rotated cookie takes
+            # effect without rebuilding the persistent session
+            auth = await self._get_auth()
             
-            # First try cookie authentication
-            cookie_auth = self._get_cookie_auth()
-            if cookie_auth:
-                auth = cookie_auth
-            # Fallback to username/password if provided
-            elif self.config.auth and 'username' in self.config.auth and 'password' in self.config.auth:
-                auth = aiohttp.BasicAuth(
-                    login=self.config.auth['username'],
-                    password=self.config.auth['password']
-                )
+            session = self._get_session()
+            
+            # Step 1: Get block hash for the given height (cached for confirmed blocks)
+            block_hash, error_msg = await self._get_block_hash(session, auth, block_height)
+            if not block_hash:
+                return self._error_result(error_msg, block_height, start_time)
+            
+            # Step 2: Get silent payment data using the block hash
+            sp_data_body = self._sp_data_tmpl % block_hash.encode()
             
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+            self.logger.debug("Getting silent payment data for block hash %s", block_hash)
+            
+            async with session.post(
+                self.config.endpoint,
+                data=sp_data_body,
+                headers=self._headers,
                 auth=auth
-            ) as session:
-                headers = {'Content-Type': 'application/json'}
-                if self.config.headers:
-                    headers.update(self.config.headers)
-                
-                # Step 1: Get block hash for the given height
-                block_hash_payload = {
-                    "jsonrpc": "1.0",
-                    "id": "get_block_hash",
-                    "method": "getblockhash",
-                    "params": [block_height]
-                }
-                
-                self.logger.debug(f"Getting block hash for height {block_height}")
-                
-                async with session.post(
-                    self.config.endpoint,
-                    json=block_hash_payload,
-                    headers=headers
-                ) as response:
-                    if response.status != 200:
-                        error_msg = f"Failed to get block hash: HTTP {response.status}: {await response.text()}"
-                        self.logger.error(error_msg)
-                        return ServiceResult(
-                            service_name=self.config.name,
-                            block_height=block_height,
-                            tweaks=[],
-                            request_time=time.time() - start_time,
-                            success=False,
-                            error_message=error_msg
-                        )
+            ) as response:
+                if response.status == 200:
+                    if _STREAM_PARSE:
+                        tweaks, rpc_error = await self._stream_tweaks(response, block_height)
+                    else:
+                        raw_data = json_codec.loads(await response.read())
+                        rpc_error = raw_data.get('error')
+                        tweaks = await self._normalize_response_async(raw_data.get('result', {}), block_height)
                     
-                    hash_data = await response.json()
-                    if 'error' in hash_data and hash_data['error']:
-                        error_msg = f"RPC error getting block hash: {hash_data['error']}"
-                        self.logger.error(error_msg)
-                        return ServiceResult(
-                            service_name=self.config.name,
-                            block_height=block_height,
-                            tweaks=[],
-                            request_time=time.time() - start_time,
-                            success=False,
-                            error_message=error_msg
-                        )
+                    if rpc_error:
+                        error_msg = f"RPC error: {rpc_error}"
+                        return self._error_result(error_msg, block_height, start_time)
                     
-                    block_hash = hash_data.get('result')
-                    if not block_hash:
-                        error_msg = f"No block hash returned for height {block_height}"
-                        self.logger.error(error_msg)
-                        return ServiceResult(
-                            service_name=self.config.name,
-                            block_height=block_height,
-                            tweaks=[],
-                            request_time=time.time() - start_time,
-                            success=False,
-                            error_message=error_msg
-                        )
-                
-                # Step 2: Get silent payment data using the block hash
-                # Use filter_spent and dust_limit from config if available, otherwise default
-                filter_spent = self.config.filter_spent if self.config.filter_spent is not None else False
-                dust_limit = self.config.dust_limit if self.config.dust_limit is not None else 0
-                sp_data_payload = {
-                    "jsonrpc": "1.0",
-                    "id": "silent_payments_audit",
-                    "method": "getsilentpaymentblockdata",
-                    "params": [block_hash, dust_limit, filter_spent]
-                }
-                
-                self.logger.debug(f"Getting silent payment data for block hash {block_hash}")
-                
-                async with session.post(
-                    self.config.endpoint,
-                    json=sp_data_payload,
-                    headers=headers
-                ) as response:
-                    if response.status == 200:
-                        raw_data = await response.json()
-                        
-                        if 'error' in raw_data and raw_data['error']:
-                            error_msg = f"RPC error: {raw_data['error']}"
-                            self.logger.error(error_msg)
-                            return ServiceResult(
-                                service_name=self.config.name,
-                                block_height=block_height,
-                                tweaks=[],
-                                request_time=time.time() - start_time,
-                                success=False,
-                                error_message=error_msg
-                            )
-                        
-                        tweaks = self._normalize_response(raw_data.get('result', {}), block_height)
-                        
-                        return ServiceResult(
-                            service_name=self.config.name,
-                            block_height=block_height,
-                            tweaks=tweaks,
-                            request_time=time.time() - start_time,
-                            success=True
-                        )
-                    else:
-                        error_msg = f"RPC HTTP {response.status}: {await response.text()}"
-                        self.logger.error(error_msg)
-                        return ServiceResult(
-                            service_name=self.config.name,
-                            block_height=block_height,
-                            tweaks=[],
-                            request_time=time.time() - start_time,
-                            success=False,
-                            error_message=error_msg
-                        )
+                    return ServiceResult(
+                        service_name=self.config.name,
+                        block_height=block_height,
+                        tweaks=tweaks,
+                        request_time=time.perf_counter() - start_time,
+                        success=True
+                    )
+                else:
+                    self._check_auth_status(response.status)
+                    error_msg = f"RPC HTTP {response.status}: {await read_error_body(response)}"
+                    return self._error_result(error_msg, block_height, start_time)
         
         except Exception as e:
             error_msg = f"Bitcoin Core RPC request error: {str(e)}"
-            self.logger.error(error_msg)
-            return ServiceResult(
-                service_name=self.config.name,
-                block_height=block_height,
-                tweaks=[],
-                request_time=time.time() - start_time,
-                success=False,
-                error_message=error_msg
-            )
+            return self._error_result(error_msg, block_height, start_time)
+    
+    async def _stream_tweaks(self, response: aiohttp.ClientResponse, block_height: int) -> Tuple[List[TweakData], Any]:
+        """
+        Decode a getsilentpaymentblockdata response while it is being received
+        
+        Tweaks are built straight from the parser events for
+        result.bip352_tweaks, so the body is never buffered or decoded whole.
+        
+        Returns:
+            Tuple of (tweaks, RPC error); the error is None on success
+        """
+        tweaks = []
+        keep_raw = self.config.keep_raw
+        index = 0
+        error_builder = None
+        
+        async for prefix, event, value in ijson.parse_async(response.content):
+            if prefix == 'result.bip352_tweaks.item':
+                if event == 'string' and value:
+                    if not _is_tweak_hex(value):
+                        self.logger.debug("Skipping malformed tweak at index %s in block %s: %r", index, block_height, value)
+                        index += 1
+                        continue
+                    value = value.lower()
+                    tweaks.append(TweakData(
+                        tweak_hash=value,
+                        block_height=block_height,
+                        transaction_id='',
+                        output_index=index,
+                        raw_data={
+                            'tweak': value,
+                            'index': index,
+                            'source': 'bitcoin_core_bip352'
+                        } if keep_raw else None
+                    ))
+                if event not in ('map_key', 'end_map', 'end_array'):
+                    index += 1
+            elif prefix == 'error' or prefix.startswith('error.'):
+                if error_builder is None:
+                    if event == 'null':
+                        continue
+                    error_builder = ijson.ObjectBuilder()
+                error_builder.event(event, value)
+        
+        return tweaks, error_builder.value if error_builder is not None else None
     
     def _build_rpc_payload(self, block_height: int) -> Dict[str, Any]:
         """Build Bitcoin Core specific RPC payload - not used in this implementation"""
-        # This method is not used since we override get_tweaks_for_block
+        # This method is not used since we override _fetch_tweaks_for_block
         # to handle the two-step process (getblockhash -> getsilentpaymentblockdata)
         return {
             "jsonrpc": "1.0",
@@ -267,38 +596,50 @@ class BitcoinCoreRPCService(RPCIndexService):
     
     def _normalize_response(self, raw_response: Any, block_height: int) -> List[TweakData]:
         """Normalize Bitcoin Core response format"""
-        tweaks = []
-        
         # Bitcoin Core returns the tweaks in the 'bip352_tweaks' field
         # Each tweak is a hex string representing the tweak hash
-        if isinstance(raw_response, dict) and 'bip352_tweaks' in raw_response:
-            bip352_tweaks = raw_response['bip352_tweaks']
-            
-            if isinstance(bip352_tweaks, list):
-                for i, tweak_hash in enumerate(bip352_tweaks):
-                    if isinstance(tweak_hash, str) and tweak_hash:
-                        tweak = TweakData(
-                            tweak_hash=tweak_hash,
-                            block_height=block_height,
-                            transaction_id='',  # Bitcoin Core doesn't provide txid in this response
-                            output_index=i,     # Use array index as output index
-                            raw_data={
-                                'tweak': tweak_hash,
-                                'index': i,
-                                'source': 'bitcoin_core_bip352'
-                            }
-                        )
-                        tweaks.append(tweak)
+        if not isinstance(raw_response, dict):
+            return []
+        bip352_tweaks = raw_response.get('bip352_tweaks')
+        if not isinstance(bip352_tweaks, list):
+            return []
         
+        keep_raw = self.config.keep_raw
+        tweaks = [
+            TweakData(
+                tweak_hash=tweak_hash,
+                block_height=block_height,
+                transaction_id='',  # Bitcoin Core doesn't provide txid in this response
+                output_index=i,     # Use array index as output index
+                raw_data={
+                    'tweak': tweak_hash,
+                    'index': i,
+                    'source': 'bitcoin_core_bip352'
+                } if keep_raw else None
+            )
+            for i, raw_hash in enumerate(bip352_tweaks)
+            if isinstance(raw_hash, str) and _is_tweak_hex(raw_hash)
+            # Lowercased once, for both tweak_hash and raw_data
+            for tweak_hash in (raw_hash.lower(),)
+        ]
+        
+        skipped = len(bip352_tweaks) - len(tweaks)
+        if skipped:
+            self.logger.debug("Skipped %s empty or malformed tweaks in block %s", skipped, block_height)
         return tweaks
 
 
+@register_service(ServiceType.HTTP, 'electrum')
 class ElectrumServerService(HTTPIndexService):
     """Electrum server HTTP API implementation"""
     
+    def __init__(self, config: ServiceConfig):
+        super().__init__(config)
+        self._url_prefix = f"{config.endpoint}/blockchain.block.header/"
+    
     def _build_url(self, block_height: int) -> str:
         """Build Electrum server specific URL"""
-        return f"{self.config.endpoint}/blockchain.block.header/{block_height}"
+        return self._url_prefix + str(block_height)
     
     def _normalize_response(self, raw_response: Any, block_height: int) -> List[TweakData]:
         """Normalize Electrum server response format"""
@@ -310,6 +651,7 @@ class ElectrumServerService(HTTPIndexService):
         return tweaks
 
 
+@register_service(ServiceType.SOCKET_RPC, 'esplora', 'electrs')
 class ElectrsRPCService(SocketRPCIndexService):
     """Electrs/Esplora Cake socket RPC service implementation"""
     
@@ -321,81 +663,44 @@ class ElectrsRPCService(SocketRPCIndexService):
     
     def _normalize_response(self, raw_response: Any, block_height: int) -> List[TweakData]:
         """Normalize Electrs response format"""
-        tweaks = []
-        
         # Electrs returns a list of tweak strings or objects
         if isinstance(raw_response, list):
-            for i, tweak_data in enumerate(raw_response):
-                if isinstance(tweak_data, str):
-                    # Simple string response - just the tweak hash
-                    tweak = TweakData(
-                        tweak_hash=tweak_data,
-                        block_height=block_height,
-                        transaction_id='',  # Not provided in simple format
-                        output_index=i,     # Use index as placeholder
-                        raw_data={'tweak': tweak_data}
-                    )
-                    tweaks.append(tweak)
-                elif isinstance(tweak_data, dict):
-                    # More detailed response format
-                    tweak = TweakData(
-                        tweak_hash=tweak_data.get('tweak', tweak_data.get('hash', '')),
-                        block_height=block_height,
-                        transaction_id=tweak_data.get('txid', tweak_data.get('transaction_id', '')),
-                        output_index=tweak_data.get('vout', tweak_data.get('output_index', i)),
-                        raw_data=tweak_data
-                    )
-                    tweaks.append(tweak)
+            return self._normalize_tweak_list(raw_response, block_height)
         
-        return tweaks
+        return []
 
 
+@register_service(ServiceType.HTTP, 'blindbit')
 class TweakIndexHTTPService(HTTPIndexService):
     """HTTP Tweak Index service implementation"""
     
+    supports_msgpack = True
+    
+    def __init__(self, config: ServiceConfig):
+        super().__init__(config)
+        base_endpoint = config.endpoint.rstrip('/')
+        self._url_prefix = f"{base_endpoint}/"
+        
+        # Add dust_limit as query parameter if configured
+        self._dust_qs = ""
+        if config.dust_limit is not None:
+            separator = '&' if '?' in base_endpoint else '?'
+            self._dust_qs = f"{separator}dust_limit={config.dust_limit}"
+    
     def _build_url(self, block_height: int) -> str:
         """Build URL for the tweak index endpoint"""
-        base_endpoint = self.config.endpoint.rstrip('/')
-        base_url = f"{base_endpoint}/{block_height}"
-
-        # Add dust_limit as query parameter if configured
-        if hasattr(self.config, 'dust_limit') and self.config.dust_limit is not None:
-            separator = '&' if '?' in base_url else '?'
-            base_url += f"{separator}dust_limit={self.config.dust_limit}"
-        return base_url
+        return self._url_prefix + str(block_height) + self._dust_qs
     
     def _normalize_response(self, raw_response: Any, block_height: int) -> List[TweakData]:
         """Normalize tweak index HTTP response format"""
-        tweaks = []
-        
         # Handle different possible response formats
         
         # Format 1: Direct array of tweaks
         if isinstance(raw_response, list):
-            for i, tweak_item in enumerate(raw_response):
-                if isinstance(tweak_item, str):
-                    # Simple string response - just the tweak hash
-                    tweak = TweakData(
-                        tweak_hash=tweak_item,
-                        block_height=block_height,
-                        transaction_id='',
-                        output_index=i,
-                        raw_data={'tweak': tweak_item, 'index': i}
-                    )
-                    tweaks.append(tweak)
-                elif isinstance(tweak_item, dict):
-                    # Object with more details
-                    tweak = TweakData(
-                        tweak_hash=tweak_item.get('tweak', tweak_item.get('hash', '')),
-                        block_height=block_height,
-                        transaction_id=tweak_item.get('txid', tweak_item.get('transaction_id', '')),
-                        output_index=tweak_item.get('vout', tweak_item.get('output_index', i)),
-                        raw_data=tweak_item
-                    )
-                    tweaks.append(tweak)
+            return self._normalize_tweak_list(raw_response, block_height)
         
         # Format 2: Object with tweaks array
-        elif isinstance(raw_response, dict):
+        if isinstance(raw_response, dict):
             # Check various possible field names for the tweaks array
             tweaks_array = (raw_response.get('tweaks') or 
                           raw_response.get('silent_payment_tweaks') or
@@ -404,42 +709,23 @@ class TweakIndexHTTPService(HTTPIndexService):
                           [])
             
             if isinstance(tweaks_array, list):
-                for i, tweak_item in enumerate(tweaks_array):
-                    if isinstance(tweak_item, str):
-                        tweak = TweakData(
-                            tweak_hash=tweak_item,
-                            block_height=block_height,
-                            transaction_id='',
-                            output_index=i,
-                            raw_data={'tweak': tweak_item, 'index': i}
-                        )
-                        tweaks.append(tweak)
-                    elif isinstance(tweak_item, dict):
-                        tweak = TweakData(
-                            tweak_hash=tweak_item.get('tweak', tweak_item.get('hash', '')),
-                            block_height=block_height,
-                            transaction_id=tweak_item.get('txid', tweak_item.get('transaction_id', '')),
-                            output_index=tweak_item.get('vout', tweak_item.get('output_index', i)),
-                            raw_data=tweak_item
-                        )
-                        tweaks.append(tweak)
+                return self._normalize_tweak_list(tweaks_array, block_height)
             
             # Handle case where the response itself contains metadata
-            elif 'block_height' in raw_response:
-                # Single tweak response or metadata format
-                if 'tweak' in raw_response or 'hash' in raw_response:
-                    tweak = TweakData(
-                        tweak_hash=raw_response.get('tweak', raw_response.get('hash', '')),
-                        block_height=block_height,
-                        transaction_id=raw_response.get('txid', ''),
-                        output_index=raw_response.get('vout', 0),
-                        raw_data=raw_response
-                    )
-                    tweaks.append(tweak)
+            # Single tweak response or metadata format
+            if 'block_height' in raw_response and ('tweak' in raw_response or 'hash' in raw_response):
+                return [TweakData(
+                    tweak_hash=raw_response.get('tweak', raw_response.get('hash', '')),
+                    block_height=block_height,
+                    transaction_id=raw_response.get('txid', ''),
+                    output_index=raw_response.get('vout', 0),
+                    raw_data=raw_response if self.config.keep_raw else None
+                )]
         
-        return tweaks
+        return []
 
 
+@register_service(ServiceType.GRPC, 'blindbit')
 class BlindBitGRPCService(GRPCIndexService):
     """BlindBit Oracle gRPC service implementation"""
     
@@ -459,9 +745,9 @@ class BlindBitGRPCService(GRPCIndexService):
         except ImportError as e:
             raise ImportError(f"Failed to import gRPC dependencies: {e}. Make sure grpcio and protobuf are installed.")
     
-    async def get_tweaks_for_block(self, block_height: int) -> ServiceResult:
+    async def _fetch_tweaks_for_block(self, block_height: int) -> ServiceResult:
         """Get tweaks via BlindBit Oracle gRPC"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Get gRPC channel and create stub
@@ -477,163 +763,165 @@ class BlindBitGRPCService(GRPCIndexService):
                     block_height=block_height,
                     dust_limit=dust_limit
                 )
-                self.logger.debug(f"Making gRPC GetTweakIndexArray request for block {block_height} with dust_limit={dust_limit}")
-                response = stub.GetTweakIndexArray(request, timeout=self.config.timeout)
+                self.logger.debug("Making gRPC GetTweakIndexArray request for block %s with dust_limit=%s", block_height, dust_limit)
+                response = await stub.GetTweakIndexArray(request, timeout=self.config.timeout)
             else:
                 # Use basic GetTweakArray
                 request = self.BlockHeightRequest(
                     block_height=block_height
                 )
-                self.logger.debug(f"Making gRPC GetTweakArray request for block {block_height}")
-                response = stub.GetTweakArray(request, timeout=self.config.timeout)
+                self.logger.debug("Making gRPC GetTweakArray request for block %s", block_height)
+                response = await stub.GetTweakArray(request, timeout=self.config.timeout)
             
             # Normalize the response
-            tweaks = self._normalize_response(response, block_height)
+            tweaks = await self._normalize_response_async(response, block_height)
             
             return ServiceResult(
                 service_name=self.config.name,
                 block_height=block_height,
                 tweaks=tweaks,
-                request_time=time.time() - start_time,
+                request_time=time.perf_counter() - start_time,
                 success=True
             )
             
         except Exception as e:
             error_msg = f"BlindBit gRPC request error: {str(e)}"
-            self.logger.error(error_msg)
-            
-            return ServiceResult(
-                service_name=self.config.name,
-                block_height=block_height,
-                tweaks=[],
-                request_time=time.time() - start_time,
-                success=False,
-                error_message=error_msg
-            )
+            return self._error_result(error_msg, block_height, start_time)
         finally:
-            # Note: We keep the channel open for reuse, it will be closed when the service is destroyed
+            # Note: We keep the channel open for reuse, it is closed by close()
             pass
     
-    async def get_tweaks_for_range_stream(self, start_block: int, end_block: int) -> List[ServiceResult]:
-        """Get tweaks for a range of blocks using StreamBlockBatchSlim streaming"""
-        start_time = time.time()
-        results = []
+    async def stream_tweaks_for_range(self, start_block: int, end_block: int) -> AsyncIterator[ServiceResult]:
+        """
+        Stream tweaks for a range of blocks using StreamBlockBatchSlim
         
-        try:
-            # Get gRPC channel and create stub
-            channel = self._get_channel()
-            stub = self.OracleServiceStub(channel)
-            
-            # Create ranged request
-            request = self.RangedBlockHeightRequest(
-                start=start_block,
-                end=end_block
-            )
-            
-            self.logger.debug(f"Making gRPC StreamBlockBatchSlim request for blocks {start_block}-{end_block}")
+        Each block's ServiceResult is yielded as soon as it arrives, so callers
+        can compare blocks while the rest of the range is still being received.
+        
+        Args:
+            start_block: Starting block height (inclusive)
+            end_block: Ending block height (inclusive)
             
-            # Start streaming
-            stream = stub.StreamBlockBatchSlim(request, timeout=self.config.timeout)
+        Yields:
+            One ServiceResult per streamed block; request_time is the time
+            spent waiting for that block
             
-            try:
-                for batch in stream:
-                    # Extract block height from the batch
-                    block_height = batch.block_identifier.block_height
-                    
-                    # Normalize the batch response for this block
-                    tweaks = self._normalize_stream_response(batch, block_height)
-                    
-                    # Create ServiceResult for this block
-                    result = ServiceResult(
-                        service_name=self.config.name,
-                        block_height=block_height,
-                        tweaks=tweaks,
-                        request_time=time.time() - start_time,  # Will be updated at the end
-                        success=True
-                    )
-                    results.append(result)
-                    
-                    self.logger.debug(f"Processed block {block_height} from stream: {len(tweaks)} tweaks")
-            
-            except Exception as stream_error:
-                error_msg = f"Stream processing error: {str(stream_error)}"
-                self.logger.error(f"BlindBit stream processing failed: {error_msg}, aborting range audit")
-                
-                # Return empty results list to indicate stream failure
-                return []
+        Raises:
+            Exception: If the stream cannot be opened or fails part way
+        """
+        # Get gRPC channel and create stub
+        channel = self._get_channel()
+        stub = self.OracleServiceStub(channel)
+        
+        # Create ranged request
+        request = self.RangedBlockHeightRequest(
+            start=start_block,
+            end=end_block
+        )
+        
+        self.logger.debug("Making gRPC StreamBlockBatchSlim request for blocks %s-%s", start_block, end_block)
+        
+        # Start streaming; the channel stays open for reuse and is closed by close()
+        stream = stub.StreamBlockBatchSlim(request, timeout=self.config.timeout)
+        
+        block_start = time.perf_counter()
+        async for batch in stream:
+            # Extract block height from the batch
+            block_height = batch.block_identifier.block_height
             
-            # Update timing for all results
-            total_time = time.time() - start_time
-            for result in results:
-                result.request_time = total_time / len(results) if results else 0.0
+            # Normalize the batch response for this block
+            tweaks = self._normalize_stream_response(batch, block_height)
             
-            self.logger.info(f"Completed StreamBlockBatchSlim for {len(results)} blocks in {total_time:.2f}s")
-            return results
+            result = ServiceResult(
+                service_name=self.config.name,
+                block_height=block_height,
+                tweaks=tweaks,
+                request_time=time.perf_counter() - block_start,
+                success=True
+            )
+            self.logger.debug("Processed block %s from stream: %s tweaks", block_height, len(tweaks))
             
+            yield result
+            block_start = time.perf_counter()
+    
+    async def get_tweaks_for_range_stream(self, start_block: int, end_block: int) -> List[ServiceResult]:
+        """Get tweaks for a range of blocks using StreamBlockBatchSlim streaming, collected into a list"""
+        start_time = time.perf_counter()
+        
+        try:
+            results = [result async for result in self.stream_tweaks_for_range(start_block, end_block)]
         except Exception as e:
             error_msg = f"BlindBit streaming request error: {str(e)}"
             self.logger.error(f"{error_msg}, aborting range audit")
+            
+            # Return empty results list to indicate stream failure
             return []
-        finally:
-            # Note: We keep the channel open for reuse, it will be closed when the service is destroyed
-            pass
+        
+        total_time = time.perf_counter() - start_time
+        self.logger.info(f"Completed StreamBlockBatchSlim for {len(results)} blocks in {total_time:.2f}s")
+        return results
     
     def _normalize_response(self, raw_response: Any, block_height: int) -> List[TweakData]:
         """Normalize BlindBit gRPC response format"""
-        tweaks = []
-        
         # BlindBit Oracle returns a TweakArray with block_identifier and tweaks
-        if hasattr(raw_response, 'tweaks'):
-            for i, tweak_bytes in enumerate(raw_response.tweaks):
-                # Convert bytes to hex string
-                tweak_hash = tweak_bytes.hex() if isinstance(tweak_bytes, bytes) else str(tweak_bytes)
-                
-                tweak = TweakData(
-                    tweak_hash=tweak_hash,
-                    block_height=block_height,
-                    transaction_id='',  # Not provided in BlindBit Oracle response
-                    output_index=i,     # Use array index as output index
-                    raw_data={
-                        'tweak_bytes': tweak_bytes,
-                        'index': i,
-                        'source': 'blindbit_grpc_oracle'
-                    }
-                )
-                tweaks.append(tweak)
+        if not hasattr(raw_response, 'tweaks'):
+            return []
         
-        return tweaks
+        keep_raw = self.config.keep_raw
+        # Protobuf bytes fields are always bytes; map() hex-encodes them without a Python-level call per tweak
+        tweak_hashes = map(bytes.hex, raw_response.tweaks)
+        return [
+            TweakData(
+                tweak_hash=tweak_hash,
+                block_height=block_height,
+                transaction_id='',  # Not provided in BlindBit Oracle response
+                output_index=i,     # Use array index as output index
+                raw_data={
+                    'tweak_bytes': tweak_bytes,
+                    'index': i,
+                    'source': 'blindbit_grpc_oracle'
+                } if keep_raw else None
+            )
+            for i, (tweak_bytes, tweak_hash) in enumerate(zip(raw_response.tweaks, tweak_hashes))
+        ]
     
     def _normalize_stream_response(self, batch_response: Any, block_height: int) -> List[TweakData]:
         """Normalize BlindBit gRPC BlockBatchSlim stream response format"""
-        tweaks = []
-        
         # BlockBatchSlim contains: block_identifier, tweaks, new_utxos_filter, spent_utxos_filter
-        if hasattr(batch_response, 'tweaks'):
-            for i, tweak_bytes in enumerate(batch_response.tweaks):
-                # Convert bytes to hex string
-                tweak_hash = tweak_bytes.hex() if isinstance(tweak_bytes, bytes) else str(tweak_bytes)
-                
-                tweak = TweakData(
-                    tweak_hash=tweak_hash,
-                    block_height=block_height,
-                    transaction_id='',  # Not provided in BlockBatchSlim
-                    output_index=i,     # Use array index as output index
-                    raw_data={
-                        'tweak_bytes': tweak_bytes,
-                        'index': i,
-                        'source': 'blindbit_grpc_stream',
-                        'block_hash': batch_response.block_identifier.block_hash.hex() if hasattr(batch_response.block_identifier, 'block_hash') else ''
-                    }
-                )
-                tweaks.append(tweak)
+        if not hasattr(batch_response, 'tweaks'):
+            return []
         
-        return tweaks
-    
-    def __del__(self):
-        """Cleanup when service is destroyed"""
-        self._close_channel()
+        keep_raw = self.config.keep_raw
+        block_hash = ''
+        if keep_raw and hasattr(batch_response.block_identifier, 'block_hash'):
+            block_hash = batch_response.block_identifier.block_hash.hex()
+        
+        # Protobuf bytes fields are always bytes; map() hex-encodes them without a Python-level call per tweak
+        tweak_hashes = map(bytes.hex, batch_response.tweaks)
+        return [
+            TweakData(
+                tweak_hash=tweak_hash,
+                block_height=block_height,
+                transaction_id='',  # Not provided in BlockBatchSlim
+                output_index=i,     # Use array index as output index
+                raw_data={
+                    'tweak_bytes': tweak_bytes,
+                    'index': i,
+                    'source': 'blindbit_grpc_stream',
+                    'block_hash': block_hash
+                } if keep_raw else None
+            )
+            for i, (tweak_bytes, tweak_hash) in enumerate(zip(batch_response.tweaks, tweak_hashes))
+        ]
+
+
+# Parsed test data files kept per TestDataIndexService for repeat audits
+_TEST_DATA_CACHE_SIZE = 256
+# Minimum seconds between checks of the test data directory for changes
+_TEST_DATA_RECHECK_INTERVAL = 1.0
 
 
+@register_service(ServiceType.TEST_DATA)
 class TestDataIndexService(IndexServiceInterface):
     """Test data service implementation that reads from stored canonical test data files"""
     
@@ -642,94 +930,140 @@ class TestDataIndexService(IndexServiceInterface):
         if config.service_type != ServiceType.TEST_DATA:
             raise ValueError(f"TestDataIndexService requires TEST_DATA service type, got {config.service_type}")
         self.ignore_filter_mismatch = ignore_filter_mismatch
+        
+        self._test_data_dir = Path("test_data")
+        # Heights with a test data file, listed once and re-listed only when the directory changes
+        self._available: Optional[Set[int]] = None
+        self._dir_mtime: Optional[float] = None
+        self._dir_checked = 0.0
+        # Recently loaded test data files by height, least recently used first
+        self._loaded: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+    
+    def _has_test_data(self, block_height: int) -> bool:
+        """
+        Check for a block's test data file against the cached directory listing
+        
+        The directory is re-checked on a miss, and at most once per
+        _TEST_DATA_RECHECK_INTERVAL on a hit; when it has changed (files are
+        replaced atomically, see main.store_test_data) the listing is rebuilt
+        and previously loaded files are dropped.
+        """
+        now = time.monotonic()
+        if (self._available is not None and block_height in self._available
+                and now - self._dir_checked < _TEST_DATA_RECHECK_INTERVAL):
+            return True
+        
+        try:
+            dir_mtime = self._test_data_dir.stat().st_mtime
+        except OSError:
+            return False
+        self._dir_checked = now
+        if self._available is None or dir_mtime != self._dir_mtime:
+            available = set()
+            for path in self._test_data_dir.glob('block_*.json'):
+                try:
+                    available.add(int(path.stem.split('_', 1)[1]))
+                except ValueError:
+                    continue
+            self._available, self._dir_mtime = available, dir_mtime
+            self._loaded.clear()
+        return block_height in self._available
+    
+    @staticmethod
+    def _read_test_data_sync(filepath: Path) -> Dict[str, Any]:
+        """Read and parse a test data file (blocking, run in a worker thread)"""
+        return json_codec.loads(filepath.read_bytes())
+    
+    async def _load_test_data(self, block_height: int, filepath: Path) -> Dict[str, Any]:
+        """Load and parse a test data file off the event loop, reusing recently loaded ones"""
+        test_data = self._loaded.get(block_height)
+        if test_data is not None:
+            self._loaded.move_to_end(block_height)
+            return test_data
+        
+        test_data = await asyncio.to_thread(self._read_test_data_sync, filepath)
+        self._loaded[block_height] = test_data
+        if len(self._loaded) > _TEST_DATA_CACHE_SIZE:
+            self._loaded.popitem(last=False)
+        return test_data
     
-    async def get_tweaks_for_block(self, block_height: int) -> ServiceResult:
+    async def _fetch_tweaks_for_block(self, block_height: int) -> ServiceResult:
         """Get tweaks by reading from canonical test data file"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Build path to test data file
-            test_data_dir = Path("test_data")
             filename = f"block_{block_height}.json"
-            filepath = test_data_dir / filename
+            filepath = self._test_data_dir / filename
             
             # Check if file exists
-            if not filepath.exists():
+            if not self._has_test_data(block_height):
                 error_msg = f"Test data file not found: {filepath}"
-                self.logger.error(error_msg)
-                return ServiceResult(
-                    service_name=self.config.name,
-                    block_height=block_height,
-                    tweaks=[],
-                    request_time=time.time() - start_time,
-                    success=False,
-                    error_message=error_msg
-                )
+                return self._error_result(error_msg, block_height, start_time)
             
             # Read and parse canonical test data file
-            with open(filepath, 'r') as f:
-                test_data = json.load(f)
+            test_data = await self._load_test_data(block_height, filepath)
             
             # Validate test data format
             if 'tweaks' not in test_data:
                 error_msg = f"Invalid test data format in {filepath}: missing 'tweaks' field"
-                self.logger.error(error_msg)
-                return ServiceResult(
-                    service_name=self.config.name,
-                    block_height=block_height,
-                    tweaks=[],
-                    request_time=time.time() - start_time,
-                    success=False,
-                    error_message=error_msg
-                )
+                return self._error_result(error_msg, block_height, start_time)
             
             # Log which reference service was used to create this test data
             reference_service = test_data.get('reference_service', 'unknown')
-            self.logger.debug(f"Using canonical test data (originally from {reference_service})")
+            self.logger.debug("Using canonical test data (originally from %s)", reference_service)
             
             # Skip filter validation for test_data services - they ARE the reference data
             # No need to validate the reference against itself
             
             # Normalize the canonical test data to TweakData objects
-            tweaks = self._normalize_response(test_data, block_height)
+            tweaks = await self._normalize_response_async(test_data, block_height)
             
             return ServiceResult(
                 service_name=self.config.name,
                 block_height=block_height,
                 tweaks=tweaks,
-                request_time=time.time() - start_time,
+                request_time=time.perf_counter() - start_time,
                 success=True
             )
         
         except Exception as e:
             error_msg = f"Test data service error: {str(e)}"
-            self.logger.error(error_msg)
-            return ServiceResult(
-                service_name=self.config.name,
-                block_height=block_height,
-                tweaks=[],
-                request_time=time.time() - start_time,
-                success=False,
-                error_message=error_msg
-            )
+            return self._error_result(error_msg, block_height, start_time)
     
     def _normalize_response(self, raw_response: Any, block_height: int) -> List[TweakData]:
         """Normalize canonical test data format"""
         tweaks = []
+        keep_raw = self.config.keep_raw
         
         # Canonical test data format has 'tweaks' array with tweak information
         if isinstance(raw_response, dict) and 'tweaks' in raw_response:
-            for tweak_data in raw_response['tweaks']:
+            items = raw_response['tweaks']
+            # Stored files hold only tweak objects; check that once rather than per item
+            if not keep_raw and set(map(type, items)) <= {dict}:
+                return [
+                    TweakData(
+                        tweak_hash=tweak_data.get('tweak_hash', ''),
+                        block_height=block_height,
+                        transaction_id=tweak_data.get('transaction_id', ''),
+                        output_index=tweak_data.get('output_index', 0)
+                    )
+                    for tweak_data in items
+                ]
+            
+            for tweak_data in items:
                 if isinstance(tweak_data, dict):
-                    # Use raw_data as-is or create basic structure
-                    raw_data = tweak_data.get('raw_data', {})
-                    if isinstance(raw_data, dict):
-                        # Add redundant fields for compatibility with TweakData expectations
-                        full_raw_data = raw_data.copy()
-                        full_raw_data['tweak'] = tweak_data.get('tweak_hash', '')
-                        full_raw_data['index'] = tweak_data.get('output_index', 0)
-                    else:
-                        full_raw_data = raw_data or {}
+                    full_raw_data = None
+                    if keep_raw:
+                        # Use raw_data as-is or create basic structure
+                        raw_data = tweak_data.get('raw_data', {})
+                        if isinstance(raw_data, dict):
+                            # Add redundant fields for compatibility with TweakData expectations
+                            full_raw_data = raw_data.copy()
+                            full_raw_data['tweak'] = tweak_data.get('tweak_hash', '')
+                            full_raw_data['index'] = tweak_data.get('output_index', 0)
+                        else:
+                            full_raw_data = raw_data or {}
                     
                     tweak = TweakData(
                         tweak_hash=tweak_data.get('tweak_hash', ''),
@@ -759,25 +1093,18 @@ class TestDataIndexService(IndexServiceInterface):
             ref_filter_spent = False
         current_filter_spent = self.config.filter_spent
         
-        mismatches = []
+        mismatches: List[Tuple[str, Any, Any]] = []
         
         # Check dust_limit mismatch
         if ref_dust_limit != current_dust_limit:
-            mismatches.append(f"dust_limit: reference={ref_dust_limit}, current={current_dust_limit}")
+            mismatches.append(('dust_limit', current_dust_limit, ref_dust_limit))
         
         # Check filter_spent mismatch
         if ref_filter_spent != current_filter_spent:
-            mismatches.append(f"filter_spent: reference={ref_filter_spent}, current={current_filter_spent}")
+            mismatches.append(('filter_spent', current_filter_spent, ref_filter_spent))
         
         if mismatches:
-            # Format mismatches more clearly
-            mismatch_parts = []
-            if ref_dust_limit != current_dust_limit:
-                mismatch_parts.append(f"dust_limit={current_dust_limit} (expected {ref_dust_limit})")
-            if ref_filter_spent != current_filter_spent:
-                mismatch_parts.append(f"filter_spent={current_filter_spent} (expected {ref_filter_spent})")
-            
-            mismatch_details = ", ".join(mismatch_parts)
+            mismatch_details = ", ".join(f"{key}={current} (expected {ref})" for key, current, ref in mismatches)
             warning_msg = f"Service '{self.config.name}' filter mismatch with test data (from '{reference_service}'): {mismatch_details}"
             
             if self.ignore_filter_mismatch:
@@ -798,35 +1125,18 @@ def create_service_instance(config: ServiceConfig, ignore_filter_mismatch: bool
         ignore_filter_mismatch: Whether to ignore filter config mismatches
         
     Returns:
-        Appropriate service instance
+        Appropriate service instance, chosen from the classes added with register_service
     """
     service_name_lower = config.name.lower()
     
-    if config.service_type == ServiceType.HTTP:
-        if 'electrum' in service_name_lower:
-            return ElectrumServerService(config) # TODO
-        elif 'blindbit' in service_name_lower:
-            return TweakIndexHTTPService(config)
-        else:
-            return ExampleHTTPService(config)
+    service_class = next(
+        (cls for substring, cls in _SERVICE_REGISTRY.get(config.service_type, ()) if substring in service_name_lower),
+        _DEFAULT_SERVICES.get(config.service_type)
+    )
     
-    elif config.service_type == ServiceType.RPC:
-        if 'bitcoin' in service_name_lower:
-            return BitcoinCoreRPCService(config)
-        else:
-            return ExampleRPCService(config)
-    
-    elif config.service_type == ServiceType.SOCKET_RPC:
-        if 'esplora' in service_name_lower or 'electrs' in service_name_lower:
-            return ElectrsRPCService(config)
-        else:
-            return SocketRPCIndexService(config)
-    
-    elif config.service_type == ServiceType.GRPC:
-        if 'blindbit' in service_name_lower:
-            return BlindBitGRPCService(config)
-    
-    elif config.service_type == ServiceType.TEST_DATA:
+    if service_class is TestDataIndexService:
         return TestDataIndexService(config, ignore_filter_mismatch)
-
+    if service_class is not None:
+        return service_class(config)
+    
     raise ValueError(f"Unsupported service type: {config.service_type}")
@@ -2,27 +2,239 @@
 Base interface and implementations for Silent Payments indexing services
 """
 from abc import ABC, abstractmethod
+import asyncio
 import time
 import logging
-from typing import List, Dict, Any
+import socket
+import weakref
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from urllib.parse import urlparse
 import aiohttp
 
+import json_codec
 from models import ServiceConfig, ServiceResult, TweakData, ServiceType
 from socket_client import AsyncConnection
 
 
+# Connectors are bound to the event loop that created them, so the shared
+# pools are tracked per loop and keyed by (pool_size, pool_per_host, address family)
+_shared_connectors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[int, int, int], aiohttp.TCPConnector]]" = weakref.WeakKeyDictionary()
+
+# Address family to pin for loopback hosts, typically a local bitcoind
+_LOOPBACK_FAMILIES = {
+    '127.0.0.1': socket.AF_INET,
+    'localhost': socket.AF_INET,
+    '::1': socket.AF_INET6,
+}
+
+
+def get_shared_connector(config: ServiceConfig) -> aiohttp.TCPConnector:
+    """
+    Get the keep-alive connection pool shared by all HTTP/RPC services
+    
+    Sessions using it must pass connector_owner=False so closing a session
+    leaves pooled connections open for the next request. Loopback endpoints
+    get their own pool pinned to one address family, skipping dual-stack
+    resolution and happy-eyeballs connection racing.
+    
+    Args:
+        config: ServiceConfig providing the pool limits
+        
+    Returns:
+        TCPConnector bound to the running event loop
+    """
+    loop = asyncio.get_running_loop()
+    connectors = _shared_connectors.setdefault(loop, {})
+    family = _LOOPBACK_FAMILIES.get(urlparse(config.endpoint).hostname or '', 0)
+    key = (config.pool_size, config.pool_per_host, family)
+    connector = connectors.get(key)
+    if connector is None or connector.closed:
+        connector = aiohttp.TCPConnector(
+            limit=config.pool_size,
+            limit_per_host=config.pool_per_host,
+            keepalive_timeout=60,
+            ttl_dns_cache=300,
+            family=family,
+            happy_eyeballs_delay=None if family else 0.25
+        )
+        connectors[key] = connector
+    return connector
+
+
+# Field names used by list-of-object tweak responses, in lookup priority order
+_TWEAK_KEYS = ('tweak', 'hash')
+_TXID_KEYS = ('txid', 'transaction_id')
+_VOUT_KEYS = ('vout', 'output_index')
+
+
+def _resolve_tweak_keys(item: Dict[str, Any]) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+    """Pick the (tweak, txid, vout) field names present in a tweak object"""
+    tweak_key = next((k for k in _TWEAK_KEYS if k in item), None)
+    if tweak_key is None:
+        return None
+    txid_key = next((k for k in _TXID_KEYS if k in item), None)
+    vout_key = next((k for k in _VOUT_KEYS if k in item), None)
+    return tweak_key, txid_key, vout_key
+
+
+# Responses with more tweaks than this are normalized in a worker thread so a
+# large block does not stall the event loop; smaller ones are not worth the hop
+_THREAD_NORMALIZE_THRESHOLD = 256
+
+
+def _response_size(raw_response: Any) -> int:
+    """Estimate the number of tweaks in a raw response (its longest list)"""
+    if isinstance(raw_response, list):
+        return len(raw_response)
+    if isinstance(raw_response, dict):
+        return max((len(value) for value in raw_response.values() if isinstance(value, list)), default=0)
+    return 0
+
+
+# gRPC channel options: a separate subchannel pool per channel (so each holds its
+# own connection) and room for a large block's tweaks in one message
+_GRPC_CHANNEL_OPTIONS = [
+    ('grpc.use_local_subchannel_pool', 1),
+    ('grpc.max_receive_message_length', 64 * 1024 * 1024),
+]
+
+
+def _parse_host_port(config: ServiceConfig, protocol: str) -> Tuple[str, int]:
+    """
+    Get the host and port of a socket-level service from its config
+    
+    Uses config.host/config.port when both are set, otherwise parses an
+    endpoint like "127.0.0.1:60601" (an optional "scheme://" is ignored).
+    
+    Args:
+        config: ServiceConfig of the service
+        protocol: Protocol name used in error messages
+        
+    Returns:
+        Tuple of (host, port)
+        
+    Raises:
+        ValueError: If no usable host and port are configured
+    """
+    if config.host and config.port:
+        return config.host, config.port
+    if not config.endpoint:
+        raise ValueError(f"Either 'host' and 'port' or 'endpoint' must be specified for {protocol}")
+    
+    endpoint = config.endpoint.split('://', 1)[-1]
+    host, _, port_str = endpoint.rpartition(':')
+    try:
+        if not host:
+            raise ValueError("Port not specified")
+        return host, int(port_str)
+    except ValueError:
+        raise ValueError(f"Invalid endpoint format for {protocol}: {config.endpoint}. Use 'host:port' format")
+
+
+# gRPC channels are bound to their event loop as well; services targeting the same
+# server share a pool per loop, keyed by (target, channel count), as
+# [channels, number of services using them]
+_shared_grpc_channels: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, int], List[Any]]]" = weakref.WeakKeyDictionary()
+
+
+def _acquire_grpc_channels(target: str, count: int) -> List[Any]:
+    """Get the shared gRPC channel pool for a target, opening it on first use"""
+    import grpc
+    
+    pools = _shared_grpc_channels.setdefault(asyncio.get_running_loop(), {})
+    pool = pools.get((target, count))
+    if pool is None:
+        # Create insecure channels for now (no auth requirement from user)
+        channels = [grpc.aio.insecure_channel(target, options=_GRPC_CHANNEL_OPTIONS) for _ in range(count)]
+        pool = pools[(target, count)] = [channels, 0]
+    pool[1] += 1
+    return pool[0]
+
+
+async def _release_grpc_channels(target: str, count: int) -> None:
+    """Give back a shared gRPC channel pool, closing it once no service uses it"""
+    pools = _shared_grpc_channels.get(asyncio.get_running_loop(), {})
+    pool = pools.get((target, count))
+    if pool is None:
+        return
+    pool[1] -= 1
+    if pool[1] <= 0:
+        del pools[(target, count)]
+        for channel in pool[0]:
+            await channel.close()
+
+
+# Only this much of an error response body is read into the error message
+_ERROR_BODY_LIMIT = 512
+
+
+async def read_error_body(response: aiohttp.ClientResponse) -> str:
+    """
+    Read the start of an error response body for an error message
+    
+    Error pages (e.g. a proxy's HTML 502) can be large, and only the first
+    _ERROR_BODY_LIMIT bytes are useful in a log line.
+    """
+    return (await response.content.read(_ERROR_BODY_LIMIT)).decode('utf-8', 'replace')
+
+
+async def close_shared_connectors() -> None:
+    """Close the shared connection pools of the running event loop"""
+    connectors = _shared_connectors.pop(asyncio.get_running_loop(), {})
+    for connector in connectors.values():
+        await connector.close()
+
+
 class IndexServiceInterface(ABC):
     """Abstract base class for all indexing services"""
     
+    # Services whose get_tweaks_for_range fetches a whole range in a few
+    # batched requests, rather than one request per block, set this, and
+    # range_batch_size to the most blocks they put in one batched request
+    batches_ranges = False
+    range_batch_size = 1
+    
     def __init__(self, config: ServiceConfig):
         self.config = config
         self.logger = logging.getLogger(f"service.{config.name}")
+        # Bounds the number of requests this service has in flight at once
+        self._request_slots = asyncio.Semaphore(config.max_concurrent)
+        # Pending requests by block height, shared by concurrent callers
+        self._inflight: Dict[int, asyncio.Task] = {}
+        # Persistent HTTP session for HTTP/RPC services, created on first use
+        self._session: Optional[aiohttp.ClientSession] = None
     
-    @abstractmethod
     async def get_tweaks_for_block(self, block_height: int) -> ServiceResult:
         """
         Get tweaks for a specific block height
         
+        Concurrent calls for the same height share a single request, and at
+        most config.max_concurrent requests are in flight at once.
+        
+        Args:
+            block_height: The block height to query
+            
+        Returns:
+            ServiceResult containing the tweaks and metadata
+        """
+        task = self._inflight.get(block_height)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_in_slot(block_height))
+            self._inflight[block_height] = task
+            task.add_done_callback(lambda _: self._inflight.pop(block_height, None))
+        # Shielded so one caller being cancelled does not cancel the others' request
+        return await asyncio.shield(task)
+    
+    async def _fetch_in_slot(self, block_height: int) -> ServiceResult:
+        """Fetch a block once one of the service's request slots is free"""
+        async with self._request_slots:
+            return await self._fetch_tweaks_for_block(block_height)
+    
+    @abstractmethod
+    async def _fetch_tweaks_for_block(self, block_height: int) -> ServiceResult:
+        """
+        Request tweaks for a specific block height from the service
+        
         Args:
             block_height: The block height to query
             
@@ -44,64 +256,316 @@ class IndexServiceInterface(ABC):
             List of normalized TweakData objects
         """
         pass
+    
+    async def close(self):
+        """Release connections or other resources held by the service"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the service's persistent HTTP session, creating it on first use
+        
+        The session draws connections from the shared keep-alive pool and is
+        closed by close().
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=get_shared_connector(self.config),
+                connector_owner=False,
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+                json_serialize=json_codec.dumps
+            )
+        return self._session
+    
+    async def _normalize_response_async(self, raw_response: Any, block_height: int) -> List[TweakData]:
+        """
+        Normalize a response without blocking the event loop on large blocks
+        
+        Args:
+            raw_response: Raw response from the service
+            block_height: Block height for context
+            
+        Returns:
+            List of normalized TweakData objects
+        """
+        if _response_size(raw_response) > _THREAD_NORMALIZE_THRESHOLD:
+            return await asyncio.to_thread(self._normalize_response, raw_response, block_height)
+        return self._normalize_response(raw_response, block_height)
+    
+    async def get_tweaks_for_blocks(self, block_heights: Sequence[int]) -> List[ServiceResult]:
+        """
+        Get tweaks for several blocks, issuing the requests concurrently
+        
+        get_tweaks_for_block keeps at most config.max_concurrent requests in
+        flight at once.
+        
+        Args:
+            block_heights: The block heights to query
+        
+        Returns:
+            ServiceResults in the same order as block_heights
+        """
+        return await asyncio.gather(*(self.get_tweaks_for_block(height) for height in block_heights))
+    
+    async def get_tweaks_for_range(self, start_block: int, end_block: int) -> List[ServiceResult]:
+        """
+        Get tweaks for a range of blocks
+        
+        Args:
+            start_block: Starting block height (inclusive)
+            end_block: Ending block height (inclusive)
+            
+        Returns:
+            ServiceResults ordered by block height
+        """
+        return await self.get_tweaks_for_blocks(range(start_block, end_block + 1))
+    
+    def _error_result(self, error_msg: str, block_height: int, start_time: float) -> ServiceResult:
+        """
+        Log a failed request and build its ServiceResult
+        
+        Args:
+            error_msg: Description of the failure
+            block_height: The block height that was queried
+            start_time: When the request started, used for request_time
+        
+        Returns:
+            Unsuccessful ServiceResult with no tweaks
+        """
+        self.logger.error(error_msg)
+        return ServiceResult(
+            service_name=self.config.name,
+            block_height=block_height,
+            tweaks=[],
+            request_time=time.perf_counter() - start_time,
+            success=False,
+            error_message=error_msg
+        )
+    
+    def _normalize_tweak_list(self, items: List[Any], block_height: int) -> List[TweakData]:
+        """
+        Normalize a list of tweak hashes or tweak objects
+        
+        The list shape is detected once up front (a C-level pass over the item
+        types) so homogeneous responses take a loop without per-item type checks.
+        
+        Args:
+            items: List of hex strings (or raw tweak bytes) and/or dicts describing tweaks
+            block_height: Block height for context
+            
+        Returns:
+            List of normalized TweakData objects
+        """
+        item_types = set(map(type, items))
+        if item_types == {str}:
+            return self._normalize_tweak_strings(items, block_height)
+        if item_types == {bytes}:
+            # Binary tweaks from a MessagePack response
+            return self._normalize_tweak_strings(list(map(bytes.hex, items)), block_height)
+        if item_types == {dict}:
+            tweaks = self._normalize_tweak_dicts(items, block_height)
+            if tweaks is not None:
+                return tweaks
+        return self._normalize_mixed_tweaks(items, block_height)
+    
+    def _normalize_tweak_strings(self, items: List[str], block_height: int) -> List[TweakData]:
+        """Normalize a list made only of tweak hash strings"""
+        keep_raw = self.config.keep_raw
+        return [
+            TweakData(
+                tweak_hash=tweak_hash,
+                block_height=block_height,
+                transaction_id='',
+                output_index=i,
+                raw_data={'tweak': tweak_hash, 'index': i} if keep_raw else None
+            )
+            for i, tweak_hash in enumerate(items)
+        ]
+    
+    def _normalize_tweak_dicts(self, items: List[Dict[str, Any]], block_height: int) -> Optional[List[TweakData]]:
+        """
+        Normalize a list made only of tweak objects
+        
+        Field names are resolved from the first item and then read directly;
+        returns None when the objects do not all have the first item's keys,
+        since other key sets may resolve to different fields.
+        """
+        first_keys = items[0].keys()
+        if not all(item.keys() == first_keys for item in items):
+            return None
+        keys = _resolve_tweak_keys(items[0])
+        if keys is None:
+            return None
+        tweak_key, txid_key, vout_key = keys
+        keep_raw = self.config.keep_raw
+        return [
+            TweakData(
+                tweak_hash=item[tweak_key],
+                block_height=block_height,
+                transaction_id=item[txid_key] if txid_key else '',
+                output_index=item[vout_key] if vout_key else i,
+                raw_data=item if keep_raw else None
+            )
+            for i, item in enumerate(items)
+        ]
+    
+    def _normalize_mixed_tweaks(self, items: List[Any], block_height: int) -> List[TweakData]:
+        """Normalize a heterogeneous tweak list, checking each item's type and fields"""
+        tweaks = []
+        keep_raw = self.config.keep_raw
+        
+        for i, tweak_item in enumerate(items):
+            if isinstance(tweak_item, str):
+                # Simple string response - just the tweak hash
+                tweak = TweakData(
+                    tweak_hash=tweak_item,
+                    block_height=block_height,
+                    transaction_id='',
+                    output_index=i,
+                    raw_data={'tweak': tweak_item, 'index': i} if keep_raw else None
+                )
+                tweaks.append(tweak)
+            elif isinstance(tweak_item, dict):
+                # Object with more details
+                tweak = TweakData(
+                    tweak_hash=tweak_item.get('tweak', tweak_item.get('hash', '')),
+                    block_height=block_height,
+                    transaction_id=tweak_item.get('txid', tweak_item.get('transaction_id', '')),
+                    output_index=tweak_item.get('vout', tweak_item.get('output_index', i)),
+                    raw_data=tweak_item if keep_raw else None
+                )
+                tweaks.append(tweak)
+        
+        return tweaks
 
 
 class HTTPIndexService(IndexServiceInterface):
     """HTTP-based indexing service implementation"""
     
+    # Subclasses whose server can answer in MessagePack (tweaks as binary
+    # instead of hex strings) set this to negotiate it when msgpack is installed
+    supports_msgpack = False
+    
     def __init__(self, config: ServiceConfig):
         super().__init__(config)
         if config.service_type != ServiceType.HTTP:
             raise ValueError(f"HTTPIndexService requires HTTP service type, got {config.service_type}")
+        
+        self._msgpack = None
+        self._headers = config.headers or {}
+        if self.supports_msgpack:
+            try:
+                import msgpack
+            except ImportError:
+                msgpack = None
+            if msgpack is not None:
+                self._msgpack = msgpack
+                # Servers that ignore the header keep answering in JSON
+                self._headers = {'Accept': 'application/msgpack, application/json;q=0.8', **self._headers}
+        
+        # Optional HTTP/2 client, multiplexing all requests over one connection
+        self._httpx = None
+        self._http2_client = None
+        if config.prefer_http2:
+            try:
+                import httpx
+                import h2  # noqa: F401  (required by httpx for http2=True)
+            except ImportError as e:
+                raise ImportError(f"Failed to import HTTP/2 dependencies: {e}. Make sure httpx[http2] is installed.")
+            self._httpx = httpx
     
-    async def get_tweaks_for_block(self, block_height: int) -> ServiceResult:
+    async def _fetch_tweaks_for_block(self, block_height: int) -> ServiceResult:
         """Get tweaks via HTTP request"""
-        start_time = time.time()
+        if self._httpx is not None:
+            return await self._get_tweaks_for_block_http2(block_height)
+        
+        start_time = time.perf_counter()
         
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.config.timeout)) as session:
-                url = self._build_url(block_height)
-                headers = self.config.headers or {}
-                
-                self.logger.debug(f"Making HTTP request to {url}")
-                
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        raw_data = await response.json()
-                        tweaks = self._normalize_response(raw_data, block_height)
-                        
-                        return ServiceResult(
-                            service_name=self.config.name,
-                            block_height=block_height,
-                            tweaks=tweaks,
-                            request_time=time.time() - start_time,
-                            success=True
-                        )
-                    else:
-                        error_msg = f"HTTP {response.status}: {await response.text()}"
-                        self.logger.error(f"HTTP request failed: {error_msg}")
-                        
-                        return ServiceResult(
-                            service_name=self.config.name,
-                            block_height=block_height,
-                            tweaks=[],
-                            request_time=time.time() - start_time,
-                            success=False,
-                            error_message=error_msg
-                        )
+            session = self._get_session()
+            url = self._build_url(block_height)
+            
+            self.logger.debug("Making HTTP request to %s", url)
+            
+            async with session.get(url, headers=self._headers) as response:
+                if response.status == 200:
+                    raw_data = self._decode_body(await response.read(), response.content_type)
+                    tweaks = await self._normalize_response_async(raw_data, block_height)
+                    
+                    return ServiceResult(
+                        service_name=self.config.name,
+                        block_height=block_height,
+                        tweaks=tweaks,
+                        request_time=time.perf_counter() - start_time,
+                        success=True
+                    )
+                else:
+                    error_msg = f"HTTP {response.status}: {await read_error_body(response)}"
+                    return self._error_result(error_msg, block_height, start_time)
         
         except Exception as e:
             error_msg = f"HTTP request error: {str(e)}"
-            self.logger.error(error_msg)
+            return self._error_result(error_msg, block_height, start_time)
+    
+    async def _get_tweaks_for_block_http2(self, block_height: int) -> ServiceResult:
+        """Get tweaks via HTTP/2 request using the httpx client"""
+        start_time = time.perf_counter()
+        
+        try:
+            url = self._build_url(block_height)
             
-            return ServiceResult(
-                service_name=self.config.name,
-                block_height=block_height,
-                tweaks=[],
-                request_time=time.time() - start_time,
-                success=False,
-                error_message=error_msg
+            self.logger.debug("Making HTTP/2 request to %s", url)
+            
+            response = await self._get_http2_client().get(url, headers=self._headers)
+            
+            if response.status_code == 200:
+                content_type = response.headers.get('content-type', '').split(';', 1)[0].strip()
+                raw_data = self._decode_body(response.content, content_type)
+                tweaks = await self._normalize_response_async(raw_data, block_height)
+                
+                return ServiceResult(
+                    service_name=self.config.name,
+                    block_height=block_height,
+                    tweaks=tweaks,
+                    request_time=time.perf_counter() - start_time,
+                    success=True
+                )
+            else:
+                error_msg = f"HTTP {response.status_code}: {response.text[:_ERROR_BODY_LIMIT]}"
+                return self._error_result(error_msg, block_height, start_time)
+        
+        except Exception as e:
+            error_msg = f"HTTP request error: {str(e)}"
+            return self._error_result(error_msg, block_height, start_time)
+    
+    def _decode_body(self, body: bytes, content_type: str) -> Any:
+        """Decode a response body as MessagePack when negotiated, otherwise as JSON"""
+        if self._msgpack is not None and content_type == 'application/msgpack':
+            return self._msgpack.unpackb(body, raw=False)
+        return json_codec.loads(body)
+    
+    def _get_http2_client(self):
+        """Get or create the HTTP/2 client"""
+        if self._http2_client is None:
+            httpx = self._httpx
+            self._http2_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=self.config.pool_size,
+                    max_keepalive_connections=self.config.pool_size
+                ),
+                timeout=self.config.timeout
             )
+        return self._http2_client
+    
+    async def close(self):
+        """Close the HTTP session and the HTTP/2 client if one was opened"""
+        await super().close()
+        if self._http2_client is not None:
+            await self._http2_client.aclose()
+            self._http2_client = None
     
     def _build_url(self, block_height: int) -> str:
         """Build the URL for the request - to be overridden by specific implementations"""
@@ -111,20 +575,20 @@ class HTTPIndexService(IndexServiceInterface):
         """Default normalization - to be overridden by specific implementations"""
         # This is a placeholder implementation
         # Each specific service will override this method
-        tweaks = []
-        
-        if isinstance(raw_response, dict) and 'tweaks' in raw_response:
-            for tweak_data in raw_response['tweaks']:
-                tweak = TweakData(
-                    tweak_hash=tweak_data.get('hash', ''),
-                    block_height=block_height,
-                    transaction_id=tweak_data.get('txid', ''),
-                    output_index=tweak_data.get('output_index', 0),
-                    raw_data=tweak_data
-                )
-                tweaks.append(tweak)
+        if not (isinstance(raw_response, dict) and 'tweaks' in raw_response):
+            return []
         
-        return tweaks
+        keep_raw = self.config.keep_raw
+        return [
+            TweakData(
+                tweak_hash=tweak_data.get('hash', ''),
+                block_height=block_height,
+                transaction_id=tweak_data.get('txid', ''),
+                output_index=tweak_data.get('output_index', 0),
+                raw_data=tweak_data if keep_raw else None
+            )
+            for tweak_data in raw_response['tweaks']
+        ]
 
 
 class RPCIndexService(IndexServiceInterface):
@@ -134,75 +598,47 @@ class RPCIndexService(IndexServiceInterface):
         super().__init__(config)
         if config.service_type != ServiceType.RPC:
             raise ValueError(f"RPCIndexService requires RPC service type, got {config.service_type}")
+        # Request headers never change, so merge them once
+        self._headers = {'Content-Type': 'application/json', **(config.headers or {})}
     
-    async def get_tweaks_for_block(self, block_height: int) -> ServiceResult:
+    async def _fetch_tweaks_for_block(self, block_height: int) -> ServiceResult:
         """Get tweaks via RPC request"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.config.timeout)) as session:
-                rpc_payload = self._build_rpc_payload(block_height)
-                headers = {'Content-Type': 'application/json'}
-                if self.config.headers:
-                    headers.update(self.config.headers)
-                
-                self.logger.debug(f"Making RPC request to {self.config.endpoint}")
-                
-                async with session.post(
-                    self.config.endpoint, 
-                    json=rpc_payload,
-                    headers=headers
-                ) as response:
-                    if response.status == 200:
-                        raw_data = await response.json()
-                        
-                        if 'error' in raw_data and raw_data['error']:
-                            error_msg = f"RPC error: {raw_data['error']}"
-                            self.logger.error(error_msg)
-                            
-                            return ServiceResult(
-                                service_name=self.config.name,
-                                block_height=block_height,
-                                tweaks=[],
-                                request_time=time.time() - start_time,
-                                success=False,
-                                error_message=error_msg
-                            )
-                        
-                        tweaks = self._normalize_response(raw_data.get('result', {}), block_height)
-                        
-                        return ServiceResult(
-                            service_name=self.config.name,
-                            block_height=block_height,
-                            tweaks=tweaks,
-                            request_time=time.time() - start_time,
-                            success=True
-                        )
-                    else:
-                        error_msg = f"RPC HTTP {response.status}: {await response.text()}"
-                        self.logger.error(error_msg)
-                        
-                        return ServiceResult(
-                            service_name=self.config.name,
-                            block_height=block_height,
-                            tweaks=[],
-                            request_time=time.time() - start_time,
-                            success=False,
-                            error_message=error_msg
-                        )
+            session = self._get_session()
+            rpc_payload = self._build_rpc_payload(block_height)
+            
+            self.logger.debug("Making RPC request to %s", self.config.endpoint)
+            
+            async with session.post(
+                self.config.endpoint, 
+                json=rpc_payload,
+                headers=self._headers
+            ) as response:
+                if response.status == 200:
+                    raw_data = json_codec.loads(await response.read())
+                    
+                    if 'error' in raw_data and raw_data['error']:
+                        error_msg = f"RPC error: {raw_data['error']}"
+                        return self._error_result(error_msg, block_height, start_time)
+                    
+                    tweaks = await self._normalize_response_async(raw_data.get('result', {}), block_height)
+                    
+                    return ServiceResult(
+                        service_name=self.config.name,
+                        block_height=block_height,
+                        tweaks=tweaks,
+                        request_time=time.perf_counter() - start_time,
+                        success=True
+                    )
+                else:
+                    error_msg = f"RPC HTTP {response.status}: {await read_error_body(response)}"
+                    return self._error_result(error_msg, block_height, start_time)
         
         except Exception as e:
             error_msg = f"RPC request error: {str(e)}"
-            self.logger.error(error_msg)
-            
-            return ServiceResult(
-                service_name=self.config.name,
-                block_height=block_height,
-                tweaks=[],
-                request_time=time.time() - start_time,
-                success=False,
-                error_message=error_msg
-            )
+            return self._error_result(error_msg, block_height, start_time)
     
     def _build_rpc_payload(self, block_height: int) -> Dict[str, Any]:
         """Build RPC payload - to be overridden by specific implementations"""
@@ -217,20 +653,20 @@ class RPCIndexService(IndexServiceInterface):
         """Default normalization - to be overridden by specific implementations"""
         # This is a placeholder implementation
         # Each specific service will override this method
-        tweaks = []
+        if not isinstance(raw_response, list):
+            return []
         
-        if isinstance(raw_response, list):
-            for tweak_data in raw_response:
-                tweak = TweakData(
-                    tweak_hash=tweak_data.get('hash', ''),
-                    block_height=block_height,
-                    transaction_id=tweak_data.get('txid', ''),
-                    output_index=tweak_data.get('vout', 0),
-                    raw_data=tweak_data
-                )
-                tweaks.append(tweak)
-        
-        return tweaks
+        keep_raw = self.config.keep_raw
+        return [
+            TweakData(
+                tweak_hash=tweak_data.get('hash', ''),
+                block_height=block_height,
+                transaction_id=tweak_data.get('txid', ''),
+                output_index=tweak_data.get('vout', 0),
+                raw_data=tweak_data if keep_raw else None
+            )
+            for tweak_data in raw_response
+        ]
 
 
 class SocketRPCIndexService(IndexServiceInterface):
@@ -241,35 +677,14 @@ class SocketRPCIndexService(IndexServiceInterface):
         if config.service_type != ServiceType.SOCKET_RPC:
             raise ValueError(f"SocketRPCIndexService requires SOCKET_RPC service type, got {config.service_type}")
         
-        # Extract host and port from config
-        if config.host and config.port:
-            self.host = config.host
-            self.port = config.port
-        elif config.endpoint:
-            # Try to parse from endpoint format like "127.0.0.1:60601"
-            try:
-                if '://' in config.endpoint:
-                    # Remove protocol if present
-                    endpoint = config.endpoint.split('://', 1)[1]
-                else:
-                    endpoint = config.endpoint
-                
-                if ':' in endpoint:
-                    self.host, port_str = endpoint.rsplit(':', 1)
-                    self.port = int(port_str)
-                else:
-                    raise ValueError("Port not specified")
-            except (ValueError, IndexError):
-                raise ValueError(f"Invalid endpoint format for socket RPC: {config.endpoint}. Use 'host:port' format")
-        else:
-            raise ValueError("Either 'host' and 'port' or 'endpoint' must be specified for socket RPC")
+        self.host, self.port = _parse_host_port(config, "socket RPC")
     
-    async def get_tweaks_for_block(self, block_height: int) -> ServiceResult:
+    async def _fetch_tweaks_for_block(self, block_height: int) -> ServiceResult:
         """Get tweaks via socket RPC request"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            self.logger.debug(f"Making socket RPC request to {self.host}:{self.port}")
+            self.logger.debug("Making socket RPC request to %s:%s", self.host, self.port)
             
             async with AsyncConnection((self.host, self.port)) as conn:
                 method, params = self._build_rpc_call(block_height)
@@ -277,39 +692,80 @@ class SocketRPCIndexService(IndexServiceInterface):
                 
                 if 'error' in response and response['error']:
                     error_msg = f"Socket RPC error: {response['error']}"
-                    self.logger.error(error_msg)
-                    
-                    return ServiceResult(
-                        service_name=self.config.name,
-                        block_height=block_height,
-                        tweaks=[],
-                        request_time=time.time() - start_time,
-                        success=False,
-                        error_message=error_msg
-                    )
+                    return self._error_result(error_msg, block_height, start_time)
                 
-                tweaks = self._normalize_response(response.get('result', []), block_height)
+                tweaks = await self._normalize_response_async(response.get('result', []), block_height)
                 
                 return ServiceResult(
                     service_name=self.config.name,
                     block_height=block_height,
                     tweaks=tweaks,
-                    request_time=time.time() - start_time,
+                    request_time=time.perf_counter() - start_time,
                     success=True
                 )
         
         except Exception as e:
             error_msg = f"Socket RPC request error: {str(e)}"
-            self.logger.error(error_msg)
+            return self._error_result(error_msg, block_height, start_time)
+    
+    async def get_tweaks_for_blocks(self, block_heights: Sequence[int]) -> List[ServiceResult]:
+        """
+        Get tweaks for several blocks by pipelining requests over a few connections
+        
+        The blocks are split across up to config.max_concurrent connections so
+        the server still works on several in parallel; on each connection all
+        requests are sent before the responses are read, saving a round trip
+        (and a connection setup) per block.
+        
+        Args:
+            block_heights: The block heights to query
             
-            return ServiceResult(
-                service_name=self.config.name,
-                block_height=block_height,
-                tweaks=[],
-                request_time=time.time() - start_time,
-                success=False,
-                error_message=error_msg
-            )
+        Returns:
+            ServiceResults in the same order as block_heights
+        """
+        block_heights = list(block_heights)
+        if not block_heights:
+            return []
+        
+        connections = min(self.config.max_concurrent, len(block_heights))
+        chunk_size = -(-len(block_heights) // connections)
+        chunks = [block_heights[i:i + chunk_size] for i in range(0, len(block_heights), chunk_size)]
+        chunk_results = await asyncio.gather(*(self._fetch_pipelined(chunk) for chunk in chunks))
+        return [result for results in chunk_results for result in results]
+    
+    async def _fetch_pipelined(self, block_heights: List[int]) -> List[ServiceResult]:
+        """Fetch blocks over one connection; each block's request_time is its share of the total"""
+        start_time = time.perf_counter()
+        
+        try:
+            self.logger.debug("Making %s pipelined socket RPC requests to %s:%s", len(block_heights), self.host, self.port)
+            
+            async with AsyncConnection((self.host, self.port)) as conn:
+                responses = await conn.call_many([self._build_rpc_call(height) for height in block_heights])
+        
+        except Exception as e:
+            error_msg = f"Socket RPC request error: {str(e)}"
+            return [self._error_result(error_msg, height, start_time) for height in block_heights]
+        
+        results = []
+        for height, response in zip(block_heights, responses):
+            if response is None:
+                results.append(self._error_result(f"No response for block {height}", height, start_time))
+            elif 'error' in response and response['error']:
+                results.append(self._error_result(f"Socket RPC error: {response['error']}", height, start_time))
+            else:
+                results.append(ServiceResult(
+                    service_name=self.config.name,
+                    block_height=height,
+                    tweaks=await self._normalize_response_async(response.get('result', []), height),
+                    request_time=0.0,
+                    success=True
+                ))
+        
+        request_time = (time.perf_counter() - start_time) / len(block_heights)
+        for result in results:
+            result.request_time = request_time
+        return results
     
     def _build_rpc_call(self, block_height: int) -> tuple:
         """Build RPC method and parameters - to be overridden by specific implementations"""
@@ -320,6 +776,7 @@ class SocketRPCIndexService(IndexServiceInterface):
         # This is a placeholder implementation
         # Each specific service will override this method
         tweaks = []
+        keep_raw = self.config.keep_raw
         
         if isinstance(raw_response, list):
             for tweak_data in raw_response:
@@ -330,7 +787,7 @@ class SocketRPCIndexService(IndexServiceInterface):
                         block_height=block_height,
                         transaction_id='',
                         output_index=0,
-                        raw_data={'tweak': tweak_data}
+                        raw_data={'tweak': tweak_data} if keep_raw else None
                     )
                     tweaks.append(tweak)
                 elif isinstance(tweak_data, dict):
@@ -340,7 +797,7 @@ class SocketRPCIndexService(IndexServiceInterface):
                         block_height=block_height,
                         transaction_id=tweak_data.get('txid', ''),
                         output_index=tweak_data.get('vout', 0),
-                        raw_data=tweak_data
+                        raw_data=tweak_data if keep_raw else None
                     )
                     tweaks.append(tweak)
         
@@ -355,68 +812,64 @@ class GRPCIndexService(IndexServiceInterface):
         if config.service_type != ServiceType.GRPC:
             raise ValueError(f"GRPCIndexService requires GRPC service type, got {config.service_type}")
         
-        # Extract host and port from config
-        if config.host and config.port:
-            self.host = config.host
-            self.port = config.port
-            self.target = f"{self.host}:{self.port}"
-        elif config.endpoint:
-            # Try to parse from endpoint format like "127.0.0.1:50051"
-            try:
-                if '://' in config.endpoint:
-                    # Remove protocol if present
-                    endpoint = config.endpoint.split('://', 1)[1]
-                else:
-                    endpoint = config.endpoint
-                
-                if ':' in endpoint:
-                    self.host, port_str = endpoint.rsplit(':', 1)
-                    self.port = int(port_str)
-                    self.target = f"{self.host}:{self.port}"
-                else:
-                    raise ValueError("Port not specified")
-            except (ValueError, IndexError):
-                raise ValueError(f"Invalid endpoint format for gRPC: {config.endpoint}. Use 'host:port' format")
-        else:
-            raise ValueError("Either 'host' and 'port' or 'endpoint' must be specified for gRPC")
+        self.host, self.port = _parse_host_port(config, "gRPC")
+        self.target = f"{self.host}:{self.port}"
         
-        self.channel = None
+        # Channel pool, opened on first use and handed out round-robin
+        self._channels = []
+        self._next_channel = 0
     
-    async def get_tweaks_for_block(self, block_height: int) -> ServiceResult:
+    async def _fetch_tweaks_for_block(self, block_height: int) -> ServiceResult:
         """Get tweaks via gRPC request - to be implemented by specific gRPC services"""
-        raise NotImplementedError("Subclasses must implement get_tweaks_for_block")
+        raise NotImplementedError("Subclasses must implement _fetch_tweaks_for_block")
     
     def _get_channel(self):
-        """Get or create a gRPC channel"""
-        import grpc
+        """
+        Get the next asyncio gRPC channel from the pool (stub calls on it are awaitable)
         
-        if self.channel is None:
-            # Create insecure channel for now (no auth requirement from user)
-            self.channel = grpc.insecure_channel(self.target)
-        return self.channel
+        The pool is shared with other services targeting the same server on
+        this event loop. Each channel gets its own subchannel pool so it really
+        holds a separate connection instead of sharing one with the others.
+        """
+        if not self._channels:
+            self._channels = _acquire_grpc_channels(self.target, max(1, self.config.grpc_channels))
+        channel = self._channels[self._next_channel % len(self._channels)]
+        self._next_channel += 1
+        return channel
     
-    def _close_channel(self):
-        """Close the gRPC channel"""
-        if hasattr(self, 'channel') and self.channel:
-            self.channel.close()
-            self.channel = None
+    async def _close_channel(self):
+        """Release the gRPC channels; the last service using them closes them"""
+        if self._channels:
+            self._channels = []
+            await _release_grpc_channels(self.target, max(1, self.config.grpc_channels))
+    
+    async def close(self):
+        """Close the gRPC channels"""
+        await super().close()
+        await self._close_channel()
     
     def _normalize_response(self, raw_response: Any, block_height: int) -> List[TweakData]:
         """Default normalization - to be overridden by specific implementations"""
         # This is a placeholder implementation
         # Each specific gRPC service will override this method
-        tweaks = []
-        
         # Handle protobuf response format
-        if hasattr(raw_response, 'tweaks'):
-            for i, tweak_bytes in enumerate(raw_response.tweaks):
-                tweak = TweakData(
-                    tweak_hash=tweak_bytes.hex() if isinstance(tweak_bytes, bytes) else str(tweak_bytes),
-                    block_height=block_height,
-                    transaction_id='',  # Not available in basic tweak response
-                    output_index=i,     # Use index as placeholder
-                    raw_data={'tweak_bytes': tweak_bytes}
-                )
-                tweaks.append(tweak)
+        if not hasattr(raw_response, 'tweaks'):
+            return []
         
-        return tweaks
+        keep_raw = self.config.keep_raw
+        items = raw_response.tweaks
+        # A repeated bytes field holds only bytes, which map() hex-encodes in one pass
+        if set(map(type, items)) <= {bytes}:
+            tweak_hashes = map(bytes.hex, items)
+        else:
+            tweak_hashes = (item.hex() if isinstance(item, bytes) else str(item) for item in items)
+        return [
+            TweakData(
+                tweak_hash=tweak_hash,
+                block_height=block_height,
+                transaction_id='',  # Not available in basic tweak response
+                output_index=i,     # Use index as placeholder
+                raw_data={'tweak_bytes': tweak_bytes} if keep_raw else None
+            )
+            for i, (tweak_hash, tweak_bytes) in enumerate(zip(tweak_hashes, items))
+        ]
@@ -1,10 +1,10 @@
 """
 Socket-based RPC client for Esplora Cake and similar services
 """
-import json
 import socket
 import asyncio
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+import json_codec
 
 
 class Connection:
@@ -12,7 +12,11 @@ class Connection:
     
     def __init__(self, addr: Tuple[str, int]):
         self.s = socket.create_connection(addr)
-        self.f = self.s.makefile('r')
+        # Requests are small writes followed by a read; don't let Nagle hold them back
+        self.s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.s.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # Binary reads hand the raw line straight to the JSON decoder
+        self.f = self.s.makefile('rb')
         self.id = 0
 
     def call(self, method: str, *args) -> Dict[str, Any]:
@@ -20,12 +24,11 @@ class Connection:
         req = {
             'id': self.id,
             'method': method,
-            'params': list(args),
+            'params': args,  # tuples encode as JSON arrays
         }
-        msg = json.dumps(req) + '\n'
-        self.s.sendall(msg.encode('ascii'))
+        self.s.sendall(json_codec.dumps_bytes(req) + b'\n')
         self.id += 1
-        return json.loads(self.f.readline())
+        return json_codec.loads(self.f.readline())
     
     def close(self):
         """Close the connection"""
@@ -41,28 +44,85 @@ class Connection:
         self.close()
 
 
+# A block's tweak list arrives as one JSON line, well past asyncio's 64 KiB default
+_MAX_LINE = 64 * 1024 * 1024
+
+
 class AsyncConnection:
-    """Async wrapper for socket-based RPC connection"""
+    """Asyncio socket-based RPC connection for Esplora Cake"""
     
     def __init__(self, addr: Tuple[str, int]):
         self.addr = addr
-        self.connection = None
+        self.reader = None
+        self.writer = None
+        self.id = 0
     
     async def __aenter__(self):
-        # Run the synchronous connection creation in thread pool
-        loop = asyncio.get_event_loop()
-        self.connection = await loop.run_in_executor(None, Connection, self.addr)
+        host, port = self.addr
+        self.reader, self.writer = await asyncio.open_connection(host, port, limit=_MAX_LINE)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.connection:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self.connection.close)
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
     
     async def call(self, method: str, *args) -> Dict[str, Any]:
         """Make an async RPC call"""
-        if not self.connection:
+        if not self.writer:
             raise RuntimeError("Connection not established")
         
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.connection.call, method, *args)
+        req = {
+            'id': self.id,
+            'method': method,
+            'params': args,  # tuples encode as JSON arrays
+        }
+        self.writer.write(json_codec.dumps_bytes(req) + b'\n')
+        await self.writer.drain()
+        self.id += 1
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed before a response was received")
+        return json_codec.loads(line)
+    
+    async def call_many(self, calls: List[Tuple[str, List[Any]]]) -> List[Dict[str, Any]]:
+        """
+        Pipeline several RPC calls: send them all, then read all the responses
+        
+        Args:
+            calls: (method, params) pairs
+            
+        Returns:
+            Responses in the same order as calls
+            
+        Raises:
+            ConnectionError: If the connection closes early, or a response has
+                an id that is not one of the pending calls'
+        """
+        if not self.writer:
+            raise RuntimeError("Connection not established")
+        
+        first_id = self.id
+        self.writer.write(b''.join(
+            json_codec.dumps_bytes({'id': first_id + i, 'method': method, 'params': params}) + b'\n'
+            for i, (method, params) in enumerate(calls)
+        ))
+        await self.writer.drain()
+        self.id += len(calls)
+        
+        # Servers may answer out of order, so match responses back by id
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        for _ in calls:
+            line = await self.reader.readline()
+            if not line:
+                raise ConnectionError("Connection closed before all responses were received")
+            response = json_codec.loads(line)
+            response_id = response.get('id') if isinstance(response, dict) else None
+            slot = response_id - first_id if type(response_id) is int else -1
+            if not 0 <= slot < len(calls) or responses[slot] is not None:
+                raise ConnectionError(f"Unexpected response id {response_id!r} for pipelined calls")
+            responses[slot] = response
+        return responses
@@ -0,0 +1,93 @@
+"""
+Micro-benchmark for the BlindBitGRPCService client path
+
+Runs get_tweaks_for_block against an in-process stub that returns canned
+TweakArray responses, so the timings cover request setup, channel pool
+lookup and normalization without any network or oracle.
+
+Usage:
+    python tests/bench_blindbit_grpc.py [--calls 200] [--sizes 1 100 10000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import types
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import ServiceConfig, ServiceType
+from service_implementations import BlindBitGRPCService
+
+
+class CannedOracleStub:
+    """OracleServiceStub stand-in answering GetTweakArray with a fixed response"""
+
+    response = types.SimpleNamespace(tweaks=[])
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    async def GetTweakArray(self, request, timeout=None):
+        return self.response
+
+
+def stub_modules() -> dict:
+    """Stand-ins for grpc and the generated pb modules, which need not be installed"""
+    grpc = mock.MagicMock()
+    grpc.aio.insecure_channel.side_effect = lambda target, options=None: mock.AsyncMock(name=f"channel({target})")
+    oracle_service = mock.MagicMock()
+    oracle_service.OracleServiceStub = CannedOracleStub
+    return {
+        'grpc': grpc,
+        'pb': mock.MagicMock(),
+        'pb.oracle_service_pb2_grpc': oracle_service,
+        'pb.indexing_server_pb2': mock.MagicMock(),
+    }
+
+
+async def bench(tweak_count: int, calls: int) -> float:
+    """
+    Time get_tweaks_for_block for responses of tweak_count tweaks
+
+    Args:
+        tweak_count: Number of tweaks in each canned response
+        calls: Number of sequential calls to time
+
+    Returns:
+        Mean seconds per call
+    """
+    CannedOracleStub.response = types.SimpleNamespace(
+        tweaks=[i.to_bytes(33, 'big') for i in range(tweak_count)]
+    )
+    config = ServiceConfig(name="blindbit-grpc-bench", service_type=ServiceType.GRPC, endpoint="127.0.0.1:50051")
+    service = BlindBitGRPCService(config)
+    try:
+        # Warm up the channel pool and code paths before timing
+        await service.get_tweaks_for_block(0)
+        start_time = time.perf_counter()
+        for block_height in range(1, calls + 1):
+            result = await service.get_tweaks_for_block(block_height)
+            if not result.success:
+                raise RuntimeError(result.error_message)
+        return (time.perf_counter() - start_time) / calls
+    finally:
+        await service.close()
+
+
+async def main(sizes, calls: int):
+    """Run the benchmark for each response size and print the timings"""
+    print(f"{'tweaks':>8} {'per call':>12} {'per tweak':>12}")
+    for tweak_count in sizes:
+        per_call = await bench(tweak_count, calls)
+        print(f"{tweak_count:>8} {per_call * 1e6:>10.1f}us {per_call * 1e9 / max(tweak_count, 1):>10.1f}ns")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the BlindBitGRPCService client path")
+    parser.add_argument('--calls', type=int, default=200, help='Calls to time per response size')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 100, 10_000], help='Tweaks per response')
+    args = parser.parse_args()
+
+    with mock.patch.dict(sys.modules, stub_modules()):
+        asyncio.run(main(args.sizes, args.calls))
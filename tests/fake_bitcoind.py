@@ -0,0 +1,98 @@
+"""
+In-process fake of the bitcoind JSON-RPC calls the auditor uses, for tests
+
+Serves getblockhash, getblockcount and getsilentpaymentblockdata, singly or
+as JSON-RPC batches, on an ephemeral port via aiohttp's TestServer.
+"""
+import base64
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+
+def tweaks_for(block_height: int, count: int = 3) -> List[str]:
+    """Deterministic 66-character tweak hex strings for a block"""
+    return [f"02{block_height:032x}{i:032x}" for i in range(count)]
+
+
+def block_hash_for(block_height: int) -> str:
+    """The fake chain's block hash for a height (the height, zero-padded hex)"""
+    return f"{block_height:064x}"
+
+
+class FakeBitcoind:
+    """
+    Fake bitcoind answering the auditor's RPC calls
+
+    Attributes tests can change between requests:
+        tip: Current chain tip height
+        credentials: (username, password) required via HTTP basic auth, or None
+        batch_supported: When False, batch requests get a single error object
+        failing_heights: Heights whose getsilentpaymentblockdata returns an RPC error
+        extra_tweaks: Additional raw bip352_tweaks entries appended to every block
+    """
+
+    def __init__(self, tip: int = 1000):
+        self.tip = tip
+        self.credentials: Optional[Tuple[str, str]] = None
+        self.batch_supported = True
+        self.failing_heights: Set[int] = set()
+        self.extra_tweaks: List[Any] = []
+        # Count of calls per RPC method, plus 'http_posts' and 'batches'
+        self.calls: Counter = Counter()
+        # Method names of the calls in each batch request, in arrival order
+        self.batches: List[List[str]] = []
+        self._server: Optional[TestServer] = None
+
+    @property
+    def endpoint(self) -> str:
+        return str(self._server.make_url('/'))
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post('/', self._handle)
+        self._server = TestServer(app, host='127.0.0.1')
+        await self._server.start_server()
+
+    async def close(self):
+        await self._server.close()
+
+    def _authorized(self, request: web.Request) -> bool:
+        if self.credentials is None:
+            return True
+        expected = base64.b64encode(':'.join(self.credentials).encode()).decode()
+        return request.headers.get('Authorization') == f"Basic {expected}"
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.calls['http_posts'] += 1
+        if not self._authorized(request):
+            return web.Response(status=401, text="Unauthorized")
+
+        data = await request.json()
+        if isinstance(data, list):
+            self.calls['batches'] += 1
+            self.batches.append([item['method'] for item in data])
+            if not self.batch_supported:
+                return web.json_response({'result': None, 'error': {'code': -32600, 'message': 'Batch not supported'}, 'id': None})
+            return web.json_response([self._call(item) for item in data])
+        return web.json_response(self._call(data))
+
+    def _call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method, params, request_id = request['method'], request['params'], request['id']
+        self.calls[method] += 1
+
+        if method == 'getblockcount':
+            return {'result': self.tip, 'error': None, 'id': request_id}
+        if method == 'getblockhash':
+            height = params[0]
+            if height > self.tip:
+                return {'result': None, 'error': {'code': -8, 'message': 'Block height out of range'}, 'id': request_id}
+            return {'result': block_hash_for(height), 'error': None, 'id': request_id}
+        if method == 'getsilentpaymentblockdata':
+            height = int(params[0], 16)
+            if height in self.failing_heights:
+                return {'result': None, 'error': {'code': -1, 'message': f'Failed block {height}'}, 'id': request_id}
+            return {'result': {'bip352_tweaks': tweaks_for(height) + self.extra_tweaks}, 'error': None, 'id': request_id}
+        return {'result': None, 'error': {'code': -32601, 'message': 'Method not found'}, 'id': request_id}
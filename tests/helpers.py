@@ -0,0 +1,13 @@
+"""
+Shared helpers for the test modules
+"""
+import socket
+
+
+def service_reachable(host: str, port: int, timeout: float = 0.25) -> bool:
+    """Whether something accepts TCP connections on host:port, checked once at import"""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
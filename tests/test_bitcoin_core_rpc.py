@@ -0,0 +1,280 @@
+"""
+Tests for BitcoinCoreRPCService, run against an in-process fake bitcoind
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import service_implementations
+from fake_bitcoind import FakeBitcoind, tweaks_for
+from models import ServiceConfig, ServiceType
+from service_implementations import BitcoinCoreRPCService
+from service_interface import close_shared_connectors
+
+
+class BitcoinCoreTestCase(unittest.IsolatedAsyncioTestCase):
+    """Starts a fake bitcoind per test; the shared block hash cache starts empty"""
+
+    async def asyncSetUp(self):
+        service_implementations._BLOCK_HASH_CACHE.clear()
+        self.addCleanup(service_implementations._BLOCK_HASH_CACHE.clear)
+        self.node = FakeBitcoind(tip=1000)
+        await self.node.start()
+        self.addAsyncCleanup(self.node.close)
+        self.addAsyncCleanup(close_shared_connectors)
+
+    def make_service(self, **kwargs) -> BitcoinCoreRPCService:
+        config = ServiceConfig(name="bitcoin-core", service_type=ServiceType.RPC, endpoint=self.node.endpoint, **kwargs)
+        service = BitcoinCoreRPCService(config)
+        self.addAsyncCleanup(service.close)
+        return service
+
+    def assertBlocks(self, results, heights):
+        """Results are successful and hold the fake's tweaks for heights, in order"""
+        self.assertEqual([result.block_height for result in results], list(heights))
+        for result in results:
+            self.assertTrue(result.success, result.error_message)
+            self.assertEqual([tweak.tweak_hash for tweak in result.tweaks], tweaks_for(result.block_height))
+
+
+class RangeBatchTest(BitcoinCoreTestCase):
+    """get_tweaks_for_range with JSON-RPC batch requests"""
+
+    async def test_batch(self):
+        """A small range takes one getblockhash batch and one getsilentpaymentblockdata batch"""
+        service = self.make_service()
+
+        results = await service.get_tweaks_for_range(100, 109)
+
+        self.assertBlocks(results, range(100, 110))
+        self.assertEqual(self.node.calls['http_posts'], 2)
+        self.assertEqual(self.node.calls['getblockhash'], 10)
+        self.assertEqual(self.node.calls['getsilentpaymentblockdata'], 10)
+
+    async def test_partial_error(self):
+        """A failed call fails only its own block"""
+        self.node.failing_heights = {104}
+        service = self.make_service()
+
+        results = await service.get_tweaks_for_range(100, 109)
+
+        failed = results.pop(4)
+        self.assertFalse(failed.success)
+        self.assertEqual(failed.block_height, 104)
+        self.assertIn("Failed block 104", failed.error_message)
+        self.assertBlocks(results, [*range(100, 104), *range(105, 110)])
+        self.assertEqual(self.node.calls['http_posts'], 2)
+
+    async def test_heights_past_tip(self):
+        """Heights without a block hash fail without a getsilentpaymentblockdata call"""
+        service = self.make_service()
+
+        results = await service.get_tweaks_for_range(998, 1002)
+
+        self.assertBlocks(results[:3], range(998, 1001))
+        self.assertFalse(any(result.success for result in results[3:]))
+        self.assertIn("Failed to get block hash", results[3].error_message)
+        self.assertEqual(self.node.calls['getsilentpaymentblockdata'], 3)
+
+    async def test_batch_unsupported(self):
+        """When batches are rejected, every block is fetched with single calls"""
+        self.node.batch_supported = False
+        service = self.make_service()
+
+        results = await service.get_tweaks_for_range(100, 104)
+
+        self.assertBlocks(results, range(100, 105))
+        self.assertEqual(self.node.calls['batches'], 1)
+        self.assertEqual(self.node.calls['getsilentpaymentblockdata'], 5)
+
+    async def test_sub_batches(self):
+        """A range is split into range_batch_size blocks per pair of batches"""
+        service = self.make_service()
+
+        results = await service.get_tweaks_for_range(100, 159)
+
+        self.assertBlocks(results, range(100, 160))
+        sp_data_batches = [batch.count('getsilentpaymentblockdata') for batch in self.node.batches]
+        self.assertEqual(sorted(size for size in sp_data_batches if size), [10, 25, 25])
+        self.assertEqual(self.node.calls['http_posts'], 6)
+
+
+class BlockHashCacheTest(BitcoinCoreTestCase):
+    """Block hashes are cached only below the reorg window"""
+
+    async def test_buried_height_cached(self):
+        """A height reorg_depth below the tip is looked up once"""
+        service = self.make_service()
+
+        for _ in range(2):
+            self.assertBlocks([await service.get_tweaks_for_block(900)], [900])
+
+        self.assertEqual(self.node.calls['getblockhash'], 1)
+        self.assertEqual(self.node.calls['getsilentpaymentblockdata'], 2)
+
+    async def test_cache_shared_by_endpoint(self):
+        """Another service instance on the same endpoint reuses the hashes, batched or not"""
+        await self.make_service().get_tweaks_for_range(900, 909)
+
+        service = self.make_service()
+        self.assertBlocks([await service.get_tweaks_for_block(905)], [905])
+        self.assertBlocks(await service.get_tweaks_for_range(900, 909), range(900, 910))
+
+        self.assertEqual(self.node.calls['getblockhash'], 10)
+
+    async def test_near_tip_not_cached(self):
+        """Heights within reorg_depth of the tip are looked up every time"""
+        service = self.make_service(reorg_depth=6)
+
+        for _ in range(2):
+            self.assertBlocks([await service.get_tweaks_for_block(995)], [995])
+
+        self.assertEqual(self.node.calls['getblockhash'], 2)
+
+    async def test_chain_tip_ttl(self):
+        """The chain tip is fetched once per _CHAIN_TIP_TTL, not per near-tip block"""
+        service = self.make_service()
+
+        for height in range(995, 1001):
+            self.assertBlocks([await service.get_tweaks_for_block(height)], [height])
+        self.assertEqual(self.node.calls['getblockcount'], 1)
+
+        with mock.patch.object(service_implementations, '_CHAIN_TIP_TTL', 0):
+            await service.get_tweaks_for_block(995)
+        self.assertEqual(self.node.calls['getblockcount'], 2)
+
+    async def test_cached_once_buried(self):
+        """A near-tip height is cached once the refreshed tip buries it"""
+        service = self.make_service()
+        await service.get_tweaks_for_block(998)
+
+        self.node.tip = 1010
+        with mock.patch.object(service_implementations, '_CHAIN_TIP_TTL', 0):
+            await service.get_tweaks_for_block(998)
+        await service.get_tweaks_for_block(998)
+
+        self.assertEqual(self.node.calls['getblockhash'], 2)
+
+
+@unittest.skipUnless(service_implementations._STREAM_PARSE, "ijson is not installed")
+class StreamParseTest(BitcoinCoreTestCase):
+    """Single-block responses decoded with ijson while they are received"""
+
+    async def test_same_as_buffered(self):
+        """Streamed and buffered decoding give the same tweaks and raw data"""
+        service = self.make_service(keep_raw=True)
+
+        streamed = await service.get_tweaks_for_block(500)
+        with mock.patch.object(service_implementations, '_STREAM_PARSE', False):
+            buffered = await service.get_tweaks_for_block(500)
+
+        self.assertBlocks([streamed], [500])
+        self.assertEqual([(tweak.tweak_hash, tweak.output_index, tweak.raw_data) for tweak in streamed.tweaks],
+                         [(tweak.tweak_hash, tweak.output_index, tweak.raw_data) for tweak in buffered.tweaks])
+
+    async def test_rpc_error(self):
+        """An error object in the response fails the block with its contents"""
+        self.node.failing_heights = {500}
+        service = self.make_service()
+
+        result = await service.get_tweaks_for_block(500)
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.error_message, "RPC error: {'code': -1, 'message': 'Failed block 500'}")
+
+
+class TweakValidationTest(BitcoinCoreTestCase):
+    """Malformed tweaks are skipped and valid ones lowercased, in every decoding path"""
+
+    async def fetch_each_way(self, service, block_height):
+        """The block's result from the streamed, buffered and batched paths"""
+        results = {'streamed': await service.get_tweaks_for_block(block_height)}
+        with mock.patch.object(service_implementations, '_STREAM_PARSE', False):
+            results['buffered'] = await service.get_tweaks_for_block(block_height)
+        results['batched'] = (await service.get_tweaks_for_range(block_height, block_height + 1))[0]
+        return results
+
+    async def test_malformed_and_mixed_case(self):
+        """Bad entries are dropped without shifting the output index of later tweaks"""
+        self.node.extra_tweaks = ['zz' * 33, 'ab' * 32, 42, '', None, 'AB' * 33]
+        service = self.make_service()
+
+        for path, result in (await self.fetch_each_way(service, 500)).items():
+            with self.subTest(path):
+                self.assertTrue(result.success, result.error_message)
+                self.assertEqual([(tweak.tweak_hash, tweak.output_index) for tweak in result.tweaks],
+                                 [*((tweak, i) for i, tweak in enumerate(tweaks_for(500))), ('ab' * 33, 8)])
+
+
+class AuthTest(BitcoinCoreTestCase):
+    """Credentials from config or from bitcoind's cookie file"""
+
+    def write_cookie(self, password: str, mtime: float) -> str:
+        """Write the cookie file with an explicit mtime, as bitcoind does on start"""
+        with open(self.cookie_file, 'w') as f:
+            f.write(f"__cookie__:{password}")
+        os.utime(self.cookie_file, (mtime, mtime))
+        self.node.credentials = ('__cookie__', password)
+        return self.cookie_file
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        cookie_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cookie_dir.cleanup)
+        self.cookie_file = os.path.join(cookie_dir.name, '.cookie')
+
+    async def test_config_credentials(self):
+        """Username and password from config are sent with each request"""
+        self.node.credentials = ('user', 'pass')
+
+        service = self.make_service(auth={'username': 'user', 'password': 'pass'})
+        self.assertBlocks([await service.get_tweaks_for_block(500)], [500])
+
+        result = await self.make_service(auth={'username': 'user', 'password': 'wrong'}).get_tweaks_for_block(500)
+        self.assertFalse(result.success)
+        self.assertIn("HTTP 401", result.error_message)
+
+    async def test_cookie(self):
+        """The cookie file's credentials are used for single and batched requests"""
+        service = self.make_service(cookie_file=self.write_cookie('first', 1000.0))
+
+        self.assertBlocks([await service.get_tweaks_for_block(500)], [500])
+        self.assertBlocks(await service.get_tweaks_for_range(501, 502), [501, 502])
+
+    async def test_cookie_reread_after_401(self):
+        """A rejected cached cookie is dropped, so the next request reads the rewritten file"""
+        service = self.make_service(cookie_file=self.write_cookie('first', 1000.0))
+        with mock.patch.object(service_implementations, '_COOKIE_RECHECK_INTERVAL', 60.0):
+            self.assertBlocks([await service.get_tweaks_for_block(500)], [500])
+
+            self.write_cookie('second', 2000.0)
+            result = await service.get_tweaks_for_block(501)
+            self.assertFalse(result.success)
+            self.assertIn("HTTP 401", result.error_message)
+
+            self.assertBlocks([await service.get_tweaks_for_block(501)], [501])
+
+    async def test_cookie_recheck_interval(self):
+        """The cookie file is checked at most once per interval and only re-read when its mtime changes"""
+        service = self.make_service(cookie_file=self.write_cookie('first', 1000.0))
+        read_cookie = mock.Mock(wraps=BitcoinCoreRPCService._read_cookie_sync)
+
+        with mock.patch.object(BitcoinCoreRPCService, '_read_cookie_sync', read_cookie):
+            with mock.patch.object(service_implementations, '_COOKIE_RECHECK_INTERVAL', 60.0):
+                for height in range(500, 503):
+                    self.assertBlocks([await service.get_tweaks_for_block(height)], [height])
+            self.assertEqual(read_cookie.call_count, 1)
+
+            with mock.patch.object(service_implementations, '_COOKIE_RECHECK_INTERVAL', 0.0):
+                self.assertBlocks([await service.get_tweaks_for_block(503)], [503])
+                self.assertEqual(read_cookie.call_args.args[1], 1000.0)
+
+                self.write_cookie('second', 2000.0)
+                self.assertBlocks([await service.get_tweaks_for_block(504)], [504])
+            self.assertEqual(read_cookie.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+Tests for the BlindBit Oracle gRPC service, run against mocked grpc and protobuf modules
+"""
+import asyncio
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import ServiceConfig, ServiceType
+from service_implementations import BlindBitGRPCService
+
+# The OracleService RPCs BlindBitGRPCService calls; the stub mock rejects anything else
+STUB_METHODS = ['GetTweakArray', 'GetTweakIndexArray', 'StreamBlockBatchSlim']
+
+# Tweak payloads as returned in TweakArray.tweaks (33-byte compressed points)
+TWEAK_AA = b'\xaa' * 33
+TWEAK_BB = b'\xbb' * 33
+LARGE_BLOCK_TWEAKS = [i.to_bytes(33, 'big') for i in range(10_000)]
+
+
+class ChannelSpec:
+    """The part of grpc.aio.Channel the services use, as a spec for channel mocks"""
+
+    async def close(self, grace=None):
+        pass
+
+
+class BlindBitGRPCChannelTest(unittest.IsolatedAsyncioTestCase):
+    """Channel handling of BlindBitGRPCService, without opening real connections"""
+
+    def setUp(self):
+        # Stand-ins for grpc and the generated pb modules; each channel is a fresh mock
+        self.grpc = mock.MagicMock()
+        self.grpc.aio.insecure_channel.side_effect = lambda target, options=None: mock.AsyncMock(spec=ChannelSpec, name=f"channel({target})")
+        modules = {
+            'grpc': self.grpc,
+            'pb': mock.MagicMock(),
+            'pb.oracle_service_pb2_grpc': mock.MagicMock(),
+            'pb.indexing_server_pb2': mock.MagicMock(),
+        }
+        self.stub_class = modules['pb.oracle_service_pb2_grpc'].OracleServiceStub
+        self.stub_class.return_value = mock.Mock(spec=STUB_METHODS)
+        patcher = mock.patch.dict(sys.modules, modules)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_service(self, name: str = "blindbit-grpc", endpoint: str = "127.0.0.1:50051", **kwargs) -> BlindBitGRPCService:
+        config = ServiceConfig(name=name, service_type=ServiceType.GRPC, endpoint=endpoint, **kwargs)
+        return BlindBitGRPCService(config)
+
+    async def test_endpoint_parsing(self):
+        """Endpoints are parsed into host, port and target without opening any channel"""
+        cases = [
+            ("127.0.0.1:50051", "127.0.0.1", 50051),
+            ("localhost:8080", "localhost", 8080),
+            ("grpc://oracle.example.com:443", "oracle.example.com", 443),
+        ]
+        for endpoint, host, port in cases:
+            with self.subTest(endpoint=endpoint):
+                service = self.make_service(endpoint=endpoint)
+                self.assertEqual((service.host, service.port), (host, port))
+                self.assertEqual(service.target, f"{host}:{port}")
+        self.grpc.aio.insecure_channel.assert_not_called()
+
+    async def test_services_share_channels(self):
+        """Services targeting the same server reuse one channel pool"""
+        first = self.make_service()
+        second = self.make_service(name="blindbit-grpc-2")
+
+        self.assertIs(first._get_channel(), second._get_channel())
+        self.assertEqual(self.grpc.aio.insecure_channel.call_count, first.config.grpc_channels)
+
+        await first.close()
+        await second.close()
+
+    async def test_other_target_gets_own_channels(self):
+        """A different target does not reuse another server's channels"""
+        first = self.make_service()
+        second = self.make_service(endpoint="127.0.0.1:50052")
+
+        self.assertIsNot(first._get_channel(), second._get_channel())
+        self.assertEqual(self.grpc.aio.insecure_channel.call_count, 2 * first.config.grpc_channels)
+
+        await first.close()
+        await second.close()
+
+    async def test_get_tweaks_basic(self):
+        """A GetTweakArray response is normalized into hex tweaks"""
+        service = self.make_service()
+        response = types.SimpleNamespace(tweaks=[TWEAK_AA, TWEAK_BB])
+        self.stub_class.return_value.GetTweakArray = mock.AsyncMock(return_value=response)
+
+        result = await service.get_tweaks_for_block(840000)
+
+        self.assertTrue(result.success, result.error_message)
+        self.assertEqual([tweak.tweak_hash for tweak in result.tweaks], [TWEAK_AA.hex(), TWEAK_BB.hex()])
+        self.assertEqual([tweak.output_index for tweak in result.tweaks], [0, 1])
+        await service.close()
+
+    async def test_get_tweaks_large_block(self):
+        """A block with many tweaks keeps order and output indexes"""
+        service = self.make_service()
+        tweaks = LARGE_BLOCK_TWEAKS
+        self.stub_class.return_value.GetTweakArray = mock.AsyncMock(return_value=types.SimpleNamespace(tweaks=tweaks))
+
+        result = await service.get_tweaks_for_block(840000)
+
+        self.assertTrue(result.success, result.error_message)
+        self.assertEqual([tweak.tweak_hash for tweak in result.tweaks], [tweak.hex() for tweak in tweaks])
+        self.assertEqual(result.tweaks[-1].output_index, len(tweaks) - 1)
+        self.assertIsNone(result.tweaks[0].raw_data)
+        await service.close()
+
+    async def test_requests_rotate_over_channels(self):
+        """Consecutive requests are spread round-robin over the channel pool"""
+        service = self.make_service(grpc_channels=3)
+        self.stub_class.return_value.GetTweakArray = mock.AsyncMock(return_value=types.SimpleNamespace(tweaks=[]))
+
+        for block_height in range(6):
+            await service.get_tweaks_for_block(block_height)
+
+        channels = [call.args[0] for call in self.stub_class.call_args_list]
+        self.assertEqual(len({id(channel) for channel in channels}), 3)
+        self.assertEqual(channels[:3], channels[3:])
+        await service.close()
+
+    async def test_requests_bounded_by_max_concurrent(self):
+        """No more than config.max_concurrent requests are in flight at once"""
+        service = self.make_service(max_concurrent=2)
+        in_flight = peak = 0
+
+        async def get_tweak_array(request, timeout=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return types.SimpleNamespace(tweaks=[])
+
+        self.stub_class.return_value.GetTweakArray = get_tweak_array
+
+        results = await asyncio.gather(*(service.get_tweaks_for_block(height) for height in range(6)))
+
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual(peak, 2)
+        await service.close()
+
+    async def test_last_service_closes_channels(self):
+        """Shared channels stay open until the last service using them closes"""
+        first = self.make_service()
+        second = self.make_service(name="blindbit-grpc-2")
+        channel = first._get_channel()
+        second._get_channel()
+
+        await first.close()
+        channel.close.assert_not_awaited()
+
+        await second.close()
+        channel.close.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
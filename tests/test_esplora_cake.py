@@ -1,166 +1,68 @@
 """
-Test script for Esplora Cake socket RPC integration
+Tests for Esplora Cake socket RPC integration
+
+These need an Esplora Cake instance on 127.0.0.1:60601 that answers the
+'blockchain.block.tweaks' method
 """
-import asyncio
 import os
 import sys
+import unittest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from auditor import TweakServiceAuditor
 from socket_client import AsyncConnection
 from models import ServiceConfig, ServiceType
 from service_implementations import ElectrsRPCService
+from helpers import service_reachable
+
+HOST = '127.0.0.1'
+PORT = 60601
+BLOCK_HEIGHT = 258257
 
 
-async def test_esplora_cake_connection():
-    """Test the basic socket connection to Esplora Cake"""
-    
-    # Default Esplora Cake configuration
-    host = '127.0.0.1'
-    port = 60601
-    
-    print(f"Testing socket connection to {host}:{port}")
-    
-    try:
-        async with AsyncConnection((host, port)) as conn:
-            # Test basic connection with a simple call
-            response = await conn.call('blockchain.block.tweaks', 258257)
-            print(f"Raw response: {response}")
-            
-            if 'result' in response:
-                result = response['result']
-                print(f"Number of tweaks found: {len(result) if isinstance(result, list) else 'N/A'}")
-                
-                if isinstance(result, list) and result:
-                    print(f"First few tweaks: {result[:3]}")
-                
-                return True
-            else:
-                print(f"Unexpected response format: {response}")
-                return False
-                
-    except Exception as e:
-        print(f"Connection failed: {e}")
-        print("Make sure Esplora Cake is running on 127.0.0.1:60601")
-        return False
-
-
-async def test_esplora_cake_service():
-    """Test the EsploraCakeService implementation"""
-    
-    print("\nTesting EsploraCakeService implementation...")
-    
-    # Create service configuration
-    config = ServiceConfig(
-        name="test-esplora-cake",
+def esplora_cake_config(name: str = "test-esplora-cake") -> ServiceConfig:
+    """ServiceConfig for the local Esplora Cake instance"""
+    return ServiceConfig(
+        name=name,
         service_type=ServiceType.SOCKET_RPC,
-        endpoint="127.0.0.1:60601",
+        endpoint=f"{HOST}:{PORT}",
         timeout=30,
         active=True
     )
-    
-    # Create service instance
-    service = ElectrsRPCService(config)
-    
-    # Test with a block
-    block_height = 258257
-    print(f"Testing with block height: {block_height}")
-    
-    try:
-        result = await service.get_tweaks_for_block(block_height)
-        
-        print(f"Service result:")
-        print(f"  Success: {result.success}")
-        print(f"  Service: {result.service_name}")
-        print(f"  Block: {result.block_height}")
-        print(f"  Tweaks found: {len(result.tweaks)}")
-        print(f"  Request time: {result.request_time:.3f}s")
-        
-        if result.error_message:
-            print(f"  Error: {result.error_message}")
-        
-        if result.tweaks:
-            print(f"  First tweak: {result.tweaks[0].tweak_hash}")
-        
-        return result.success
-        
-    except Exception as e:
-        print(f"Service test failed: {e}")
-        return False
-
-
-async def test_with_auditor():
-    """Test using the full auditor with Esplora Cake"""
-    
-    print("\nTesting with full auditor...")
-    
-    from auditor import TweakServiceAuditor
-    
-    # Create configuration for just Esplora Cake
-    services = [
-        ServiceConfig(
-            name="esplora-cake-test",
-            service_type=ServiceType.SOCKET_RPC,
-            endpoint="127.0.0.1:60601",
-            timeout=30,
-            active=True
-        )
-    ]
-    
-    auditor = TweakServiceAuditor(services)
-    
-    block_height = 258257
-    
-    try:
-        result = await auditor.audit_block(block_height)
-        
-        print(f"Audit result:")
-        print(f"  Block: {result.block_height}")
-        print(f"  Successful services: {result.successful_services}/{result.total_services}")
-        
-        for service_name, count in result.tweak_counts.items():
-            print(f"  {service_name}: {count} tweaks")
-        
-        return result.successful_services > 0
-        
-    except Exception as e:
-        print(f"Auditor test failed: {e}")
-        return False
-
-
-async def main():
-    """Run all tests"""
-    print("Esplora Cake Integration Test")
-    print("=" * 40)
-    
-    # Test 1: Basic socket connection
-    connection_ok = await test_esplora_cake_connection()
-    
-    if not connection_ok:
-        print("\nSkipping further tests - connection failed")
-        print("\nTo run Esplora Cake locally:")
-        print("1. Make sure you have an Esplora Cake instance running")
-        print("2. Default configuration is host=127.0.0.1, port=60601")
-        print("3. The service should respond to 'blockchain.block.tweaks' method")
-        return 1
-    
-    # Test 2: Service implementation
-    service_ok = await test_esplora_cake_service()
-    
-    # Test 3: Full auditor
-    auditor_ok = await test_with_auditor()
-    
-    print(f"\n" + "=" * 40)
-    print("Test Results:")
-    print(f"  Socket connection: {'✓' if connection_ok else '✗'}")
-    print(f"  Service implementation: {'✓' if service_ok else '✗'}")
-    print(f"  Full auditor: {'✓' if auditor_ok else '✗'}")
-    
-    if all([connection_ok, service_ok, auditor_ok]):
-        print("\n✓ All tests passed! Esplora Cake integration is working.")
-        return 0
-    else:
-        print("\n✗ Some tests failed. Check the output above for details.")
-        return 1
+
+
+@unittest.skipUnless(service_reachable(HOST, PORT), f"Esplora Cake is not running on {HOST}:{PORT}")
+class EsploraCakeTest(unittest.IsolatedAsyncioTestCase):
+    """Requests against a running Esplora Cake"""
+
+    async def test_connection(self):
+        """A raw blockchain.block.tweaks call returns a list result"""
+        async with AsyncConnection((HOST, PORT)) as conn:
+            response = await conn.call('blockchain.block.tweaks', BLOCK_HEIGHT)
+
+        self.assertIn('result', response, f"Unexpected response format: {response}")
+        self.assertIsInstance(response['result'], list)
+
+    async def test_service(self):
+        """ElectrsRPCService fetches a block"""
+        service = ElectrsRPCService(esplora_cake_config())
+        self.addAsyncCleanup(service.close)
+
+        result = await service.get_tweaks_for_block(BLOCK_HEIGHT)
+
+        self.assertTrue(result.success, result.error_message)
+        self.assertEqual(result.service_name, "test-esplora-cake")
+        self.assertEqual(result.block_height, BLOCK_HEIGHT)
+
+    async def test_with_auditor(self):
+        """The auditor gets a result from Esplora Cake on its own"""
+        auditor = TweakServiceAuditor([esplora_cake_config("esplora-cake-test")])
+        self.addAsyncCleanup(auditor.close)
+
+        result = await auditor.audit_block(BLOCK_HEIGHT)
+
+        self.assertEqual(result.block_height, BLOCK_HEIGHT)
+        self.assertGreater(result.successful_services, 0)
 
 
 if __name__ == "__main__":
-    sys.exit(asyncio.run(main()))
+    unittest.main()
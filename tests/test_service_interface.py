@@ -0,0 +1,98 @@
+"""
+Tests for the shared IndexServiceInterface behavior, run without any network
+"""
+import asyncio
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import ServiceConfig, ServiceResult, ServiceType
+from service_implementations import create_service_instance
+
+
+def make_service(**kwargs):
+    """An HTTP service; normalization and request handling live in the shared base class"""
+    config = ServiceConfig(name="example-http", service_type=ServiceType.HTTP, endpoint="http://127.0.0.1:1", **kwargs)
+    return create_service_instance(config)
+
+
+def summary(tweaks):
+    """(tweak_hash, transaction_id, output_index) for each normalized tweak"""
+    return [(tweak.tweak_hash, tweak.transaction_id, tweak.output_index) for tweak in tweaks]
+
+
+class TweakListNormalizationTest(unittest.TestCase):
+    """_normalize_tweak_list across the response shapes services return"""
+
+    def test_uniform_dicts(self):
+        """Objects sharing one key set are read with the first item's field names"""
+        items = [{'tweak': 'a', 'txid': 'T', 'vout': 3}, {'tweak': 'b', 'txid': 'U', 'vout': 0}]
+        self.assertEqual(summary(make_service()._normalize_tweak_list(items, 1)), [('a', 'T', 3), ('b', 'U', 0)])
+
+    def test_mixed_key_dicts(self):
+        """Objects with differing keys resolve their fields one by one"""
+        cases = [
+            ([{'hash': 'a'}, {'tweak': 'b', 'hash': 'c'}], [('a', '', 0), ('b', '', 1)]),
+            ([{'tweak': 'a'}, {'tweak': 'b', 'txid': 'T', 'vout': 3}], [('a', '', 0), ('b', 'T', 3)]),
+            ([{'tweak': 'a', 'vout': 5}, {'tweak': 'b', 'output_index': 7}], [('a', '', 5), ('b', '', 7)]),
+        ]
+        service = make_service()
+        for items, expected in cases:
+            with self.subTest(items=items):
+                self.assertEqual(summary(service._normalize_tweak_list(items, 1)), expected)
+
+    def test_strings_and_bytes(self):
+        """Hex strings keep their position as output index; raw bytes are hex-encoded"""
+        service = make_service()
+        self.assertEqual(summary(service._normalize_tweak_list(['aa', 'bb'], 1)), [('aa', '', 0), ('bb', '', 1)])
+        self.assertEqual(summary(service._normalize_tweak_list([b'\xaa', b'\xbb'], 1)), [('aa', '', 0), ('bb', '', 1)])
+
+
+class InflightRequestTest(unittest.IsolatedAsyncioTestCase):
+    """Concurrent get_tweaks_for_block calls for one height share a single fetch"""
+
+    async def asyncSetUp(self):
+        self.service = make_service()
+        self.addAsyncCleanup(self.service.close)
+        self.release = asyncio.Event()
+        self.fetched = []
+        self.service._fetch_tweaks_for_block = self.fetch
+
+    async def fetch(self, block_height):
+        """Stands in for the network request, finishing when the test sets self.release"""
+        self.fetched.append(block_height)
+        await self.release.wait()
+        return ServiceResult(self.service.config.name, block_height, [], 0.0, True)
+
+    async def test_shared_fetch(self):
+        """Callers for the same height get one result; other heights and later calls fetch again"""
+        callers = [asyncio.create_task(self.service.get_tweaks_for_block(height)) for height in (7, 7, 8)]
+        await asyncio.sleep(0)
+        self.release.set()
+        first, second, other = await asyncio.gather(*callers)
+
+        self.assertIs(first, second)
+        self.assertEqual(other.block_height, 8)
+        self.assertEqual(self.fetched, [7, 8])
+        self.assertEqual(self.service._inflight, {})
+
+        await self.service.get_tweaks_for_block(7)
+        self.assertEqual(self.fetched, [7, 8, 7])
+
+    async def test_cancelled_caller(self):
+        """Cancelling one caller leaves the shared fetch running for the others"""
+        cancelled = asyncio.create_task(self.service.get_tweaks_for_block(7))
+        waiting = asyncio.create_task(self.service.get_tweaks_for_block(7))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await cancelled
+        self.release.set()
+
+        self.assertTrue((await waiting).success)
+        self.assertEqual(self.fetched, [7])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Tests for pipelined socket RPC calls, run against an in-process line-JSON server
+"""
+import asyncio
+import json
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import ServiceConfig, ServiceType
+from service_implementations import ElectrsRPCService
+from socket_client import AsyncConnection
+
+
+class FakeElectrsServer:
+    """
+    Line-JSON RPC server answering blockchain.block.tweaks
+
+    It reads batch_size requests, then answers them in reverse order, as a
+    server processing pipelined requests concurrently may. response_id maps
+    a request id to the id sent back, so tests can return bad ids.
+    """
+
+    def __init__(self, batch_size: int = 1, response_id=lambda request_id: request_id):
+        self.batch_size = batch_size
+        self.response_id = response_id
+        self.connections = 0
+        self.requests = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        pending = []
+        while line := await reader.readline():
+            request = json.loads(line)
+            self.requests.append(request)
+            pending.append(request)
+            if len(pending) < self.batch_size:
+                continue
+            for request in reversed(pending):
+                height = request['params'][0]
+                response = {'id': self.response_id(request['id']), 'result': [f"{height:066x}"], 'error': None}
+                writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+            pending.clear()
+        writer.close()
+
+
+class CallManyTest(unittest.IsolatedAsyncioTestCase):
+    """AsyncConnection.call_many against the fake server"""
+
+    async def start_server(self, **kwargs) -> FakeElectrsServer:
+        server = FakeElectrsServer(**kwargs)
+        await server.start()
+        self.addAsyncCleanup(server.stop)
+        return server
+
+    async def test_responses_matched_by_id(self):
+        """Out-of-order responses are returned in call order"""
+        server = await self.start_server(batch_size=4)
+        calls = [('blockchain.block.tweaks', [height]) for height in range(100, 104)]
+
+        async with AsyncConnection(('127.0.0.1', server.port)) as conn:
+            responses = await conn.call_many(calls)
+
+        self.assertEqual([response['result'] for response in responses],
+                         [[f"{height:066x}"] for height in range(100, 104)])
+        self.assertEqual([request['id'] for request in server.requests], [0, 1, 2, 3])
+
+    async def test_bad_response_id(self):
+        """A response id that matches no pending call raises ConnectionError"""
+        cases = {
+            'null': lambda request_id: None,
+            'out of range': lambda request_id: request_id + 10,
+            'negative offset': lambda request_id: request_id - 10,
+            'duplicate': lambda request_id: 0,
+            'not an int': lambda request_id: str(request_id),
+        }
+        for name, response_id in cases.items():
+            with self.subTest(name):
+                server = await self.start_server(batch_size=3, response_id=response_id)
+                async with AsyncConnection(('127.0.0.1', server.port)) as conn:
+                    with self.assertRaises(ConnectionError):
+                        await conn.call_many([('blockchain.block.tweaks', [height]) for height in range(3)])
+
+
+class PipelinedServiceTest(unittest.IsolatedAsyncioTestCase):
+    """SocketRPCIndexService.get_tweaks_for_blocks pipelines over a few connections"""
+
+    async def asyncSetUp(self):
+        self.server = FakeElectrsServer()
+        await self.server.start()
+        self.addAsyncCleanup(self.server.stop)
+
+    def make_service(self, **kwargs) -> ElectrsRPCService:
+        config = ServiceConfig(name="electrs", service_type=ServiceType.SOCKET_RPC,
+                               endpoint=f"127.0.0.1:{self.server.port}", **kwargs)
+        return ElectrsRPCService(config)
+
+    async def test_blocks_pipelined(self):
+        """Blocks are spread over max_concurrent connections and returned in order"""
+        service = self.make_service(max_concurrent=2)
+
+        results = await service.get_tweaks_for_blocks(range(200, 210))
+
+        self.assertEqual([result.block_height for result in results], list(range(200, 210)))
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual([result.tweaks[0].tweak_hash for result in results],
+                         [f"{height:066x}" for height in range(200, 210)])
+        self.assertEqual(self.server.connections, 2)
+
+    async def test_bad_response_fails_its_connection(self):
+        """A bad response id fails the blocks of that connection instead of misplacing results"""
+        self.server.response_id = lambda request_id: None
+        service = self.make_service(max_concurrent=1)
+
+        results = await service.get_tweaks_for_blocks(range(200, 203))
+
+        self.assertEqual([result.block_height for result in results], [200, 201, 202])
+        self.assertFalse(any(result.success for result in results))
+        self.assertIn("Unexpected response id", results[0].error_message)
+
+
+if __name__ == "__main__":
+    unittest.main()